@@ -0,0 +1,3 @@
+from daugx.core.agent.agent import Agent
+
+__version__ = "0.1.0"
@@ -0,0 +1,185 @@
+"""User facing entry point of daugx."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import pathlib
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import daugx.core.constants as c
+from daugx.core.agent.blocks import Blocks
+from daugx.core.agent.executor import Executor
+from daugx.core.agent.filters import FilterSequence
+from daugx.core.augmentation.annotations import Annotations
+from daugx.core.data.dataset import Dataset
+from daugx.core.data.loader import InitialLoader
+from daugx.utils.api import get_config_from_api
+from daugx.utils.misc import get_random, is_api_key, load_json
+
+logger = logging.getLogger("daugx.agent")
+
+
+# per-process executor replica, set up by _worker_init inside pool workers
+_worker_agent: Optional["Agent"] = None
+
+
+def _worker_init(input_: str, base_seed: int, rank_value) -> None:
+    global _worker_agent
+    with rank_value.get_lock():
+        rank = rank_value.value
+        rank_value.value += 1
+    # derive an independent, well-mixed stream per worker - adjacent integer
+    # seeds can correlate, SeedSequence entropy spreading does not
+    seed = int(np.random.SeedSequence([base_seed, rank]).generate_state(1)[0])
+    _worker_agent = Agent(input_, seed=seed)
+
+
+def _worker_fetch(_) -> Tuple[np.ndarray, Annotations]:
+    return _worker_agent.executor.fetch()
+
+
+class Agent:
+    def __init__(
+        self,
+        input_: str,
+        seed: Optional[int] = None,
+        prefetch: int = 0,
+        num_workers: int = 0,
+    ):
+        """Builds the full augmentation pipeline from a blueprint.
+
+        Args:
+            input_ (str): Path to a blueprint json file or a daugx api key.
+            seed (int): Seed for all probabilistic choices. Randomized when
+                omitted.
+            prefetch (int): When above zero, a background thread keeps up to
+                this many pre-augmented samples ready so fetch() returns
+                immediately while augmentation overlaps with training.
+            num_workers (int): When above zero, augmentation is fanned out to
+                this many worker processes, mirroring the PyTorch DataLoader
+                num_workers pattern. Each worker holds its own executor
+                replica built from the same blueprint.
+        """
+        self.input = input_
+        self.seed = seed if seed is not None else int(get_random() * 2 ** 31)
+        logger.info("daugx - Seed for execution: %s", self.seed)
+        self.__gen = np.random.default_rng(self.seed)
+        config = self._get_config()
+        self.datasets = self._init_datasets(config)
+        self.blocks = Blocks(self.__gen)
+        self.blocks.build(config[c.CONFIG_KEY_BLOCKS])
+        self.executor = Executor(self.blocks, self.datasets, self.__gen)
+        self.__pool: Optional[ProcessPoolExecutor] = None
+        self.__pending: deque = deque()
+        self.__pipeline_depth = 0
+        if num_workers > 0:
+            rank_value = multiprocessing.Value("i", 0)
+            self.__pool = ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_worker_init,
+                initargs=(input_, self.seed, rank_value),
+            )
+            self.__pipeline_depth = num_workers * max(prefetch, 2)
+        self.__prefetch_queue: Optional[queue.Queue] = None
+        if prefetch > 0 and self.__pool is None:
+            self.__prefetch_queue = queue.Queue(maxsize=prefetch)
+            self.__prefetch_thread = threading.Thread(target=self._prefetch_loop, daemon=True)
+            self.__prefetch_thread.start()
+
+    def fetch(self) -> Tuple[np.ndarray, Annotations]:
+        """Fetches one augmented sample."""
+        if self.__pool is not None:
+            return self._fetch_from_pool()
+        if self.__prefetch_queue is not None:
+            return self.__prefetch_queue.get()
+        return self.executor.fetch()
+
+    def _fetch_from_pool(self) -> Tuple[np.ndarray, Annotations]:
+        """Keeps the worker pipeline filled and returns the oldest result."""
+        while len(self.__pending) < self.__pipeline_depth:
+            self.__pending.append(self.__pool.submit(_worker_fetch, None))
+        return self.__pending.popleft().result()
+
+    def _prefetch_loop(self) -> None:
+        """Runs on the prefetch thread, keeping the bounded queue filled."""
+        while True:
+            self.__prefetch_queue.put(self.executor.fetch())
+
+    def fetch_torch(self):
+        """Fetches one sample with image and boundaries pinned in page-locked
+        host memory, ready for non_blocking host-to-device copies.
+
+        Use this from a PyTorch dataset/collate_fn instead of fetch() -
+        DataLoader's pin_memory=True only pins known tensor types and
+        silently skips Annotations.
+        """
+        import torch
+
+        image, annotations = self.fetch()
+        return torch.from_numpy(image).pin_memory(), annotations.pin_memory()
+
+    def fetch_batch(self, n: int) -> List[Tuple[np.ndarray, Annotations]]:
+        """Fetches n augmented samples in one call, amortizing the per-sample
+        path sampling overhead over the whole batch."""
+        return self.executor.fetch_batch(n)
+
+    def _get_config(self) -> dict:
+        if not is_api_key(self.input):
+            return load_json(self.input)
+        # cache api configs on disk so every worker process does not pay the
+        # network round trip again
+        digest = hashlib.blake2b(self.input.encode(), digest_size=16).hexdigest()
+        cache_dir = pathlib.Path.home() / ".cache" / "daugx"
+        cache_path = cache_dir / f"{digest}.json"
+        if cache_path.is_file():
+            return load_json(str(cache_path))
+        config = get_config_from_api(self.input)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(config))
+        tmp_path.replace(cache_path)
+        return config
+
+    def _init_datasets(self, config: dict) -> List[Dataset]:
+        datasets = []
+        for dataset in config[c.CONFIG_KEY_DATASETS]:
+            loader = InitialLoader(
+                dataset[c.CONFIG_KEY_IMAGE_DIR], dataset[c.CONFIG_KEY_ANNOTATION_PATH]
+            )
+            data_packages = loader.load()
+            if not data_packages:
+                logger.warning(
+                    "daugx - Dataset '%s' is empty", dataset[c.CONFIG_KEY_ANNOTATION_PATH]
+                )
+            filter_ = self._init_filter(dataset)
+            if filter_ is not None:
+                for data_package in data_packages:
+                    filter_.apply(data_package.annotations)
+            background_percentage = (
+                dataset[c.CONFIG_KEY_BACKGROUND_PERCENTAGE]
+                if c.CONFIG_KEY_BACKGROUND_PERCENTAGE in dataset
+                else None
+            )
+            datasets.append(
+                Dataset(
+                    data_packages,
+                    filter_=filter_,
+                    background_percentage=background_percentage,
+                )
+            )
+        return datasets
+
+    @staticmethod
+    def _init_filter(dataset: dict) -> Optional[FilterSequence]:
+        if c.CONFIG_KEY_FILTER not in dataset:
+            return None
+        return FilterSequence.from_string(dataset[c.CONFIG_KEY_FILTER])
@@ -0,0 +1,592 @@
+"""Block graph built from a blueprint.
+
+A blueprint is a list of block dicts. Each block has a category (input or
+augmentation), a list of next block ids and a share for every next edge.
+``Blocks.build`` expands every raw block into one built variant per share and
+wires the variants into a backwards-walkable graph. ``Blocks.fetch_path``
+samples one execution path from that graph, weighted by the external execution
+probabilities propagated from the input shares.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from copy import deepcopy
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import daugx.core.constants as c
+from daugx.core.augmentation import augmentations
+from daugx.utils.misc import new_id
+
+
+@lru_cache(maxsize=None)
+def _all_slots(cls) -> tuple:
+    """All slot names of cls including inherited ones."""
+    return tuple(slot for klass in cls.__mro__ for slot in getattr(klass, "__slots__", ()))
+
+
+class Block:
+    __slots__ = (
+        "_Block__id",
+        "_Block__category",
+        "_Block__next",
+        "_Block__prev",
+        "_Block__shares",
+        "_Block__params",
+        "_Block__share",
+        "_Block__is_set",
+    )
+
+    def __init__(
+        self,
+        id_: str,
+        category: str,
+        next_: List[str],
+        shares: List[float],
+        params: dict,
+    ):
+        """Common state of all blocks. Instantiated through Input or Augment.
+
+        Args:
+            id_ (str): Unique block id from the blueprint.
+            category (str): Block category - input or augmentation.
+            next_ (list): Ids of the next blocks, one per share. Empty for
+                output blocks.
+            shares (list): Share of data routed to each next block.
+            params (dict): Category specific parameters.
+        """
+        self.__id = id_
+        self.__category = category
+        self.__next = list(next_)
+        self.__prev: List[str] = []
+        self.__shares = list(shares)
+        self.__params = params
+        self.__share: Optional[float] = None
+        self.__is_set = False
+        if self.__shares:
+            self._normalize_shares()
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    @id.setter
+    def id(self, id_: str) -> None:
+        self.__id = id_
+
+    @property
+    def category(self) -> str:
+        return self.__category
+
+    @property
+    def next(self) -> List[str]:
+        return self.__next
+
+    @next.setter
+    def next(self, next_: List[str]) -> None:
+        self.__next = next_
+
+    @property
+    def prev(self) -> List[str]:
+        return self.__prev
+
+    @prev.setter
+    def prev(self, prev: List[str]) -> None:
+        self.__prev = prev
+
+    @property
+    def shares(self) -> List[float]:
+        return self.__shares
+
+    @property
+    def params(self) -> dict:
+        return self.__params
+
+    @property
+    def variations(self) -> int:
+        """Number of built variants this raw block expands to."""
+        return max(len(self.__shares), 1)
+
+    @property
+    def share(self) -> Optional[float]:
+        return self.__share
+
+    @property
+    def is_set(self) -> bool:
+        return self.__is_set
+
+    @property
+    def is_input(self) -> bool:
+        return self.__category == c.NODE_TYPE_INPUT
+
+    @property
+    def is_output(self) -> bool:
+        return not self.__next
+
+    def set(self, share_index: int) -> None:
+        """Binds this block variant to one of its share edges."""
+        if self.__shares:
+            self.__share = self.__shares[share_index]
+            self.__next = [self.__next[share_index]] if self.__next else []
+        else:
+            self.__share = 1.0
+        self.__is_set = True
+
+    def _normalize_shares(self) -> None:
+        arr = np.asarray(self.__shares, dtype=np.float64)
+        total = arr.sum()
+        if total > 0:
+            self.__shares = (arr / total).tolist()
+        else:
+            self.__shares = [1.0 / len(arr)] * len(arr)
+
+    def __copy__(self):
+        cls = self.__class__
+        result = cls.__new__(cls)
+        for slot in _all_slots(cls):
+            setattr(result, slot, getattr(self, slot))
+        return result
+
+    def _clone_set(self, id_: str, share_index: int) -> "Block":
+        """Clones this block and binds the clone to one share edge in a single
+        step, patching the copied state directly instead of going through
+        copy() plus per-attribute surgery."""
+        cls = self.__class__
+        result = cls.__new__(cls)
+        for slot in _all_slots(cls):
+            value = getattr(self, slot)
+            # unshare mutable per-variant state (next, shares, scratch lists)
+            if isinstance(value, list):
+                value = list(value)
+            setattr(result, slot, value)
+        result.__id = id_
+        result.__prev = []
+        shares = result.__shares
+        if shares:
+            result.__share = shares[share_index]
+            result.__next = [result.__next[share_index]] if result.__next else []
+        else:
+            result.__share = 1.0
+        result.__is_set = True
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Block):
+            return NotImplemented
+        return (
+            self.category == other.category
+            and self.params == other.params
+            and self.share == other.share
+            and self.next == other.next
+        )
+
+    def __hash__(self):
+        return object.__hash__(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id='{self.id}')"
+
+
+class Input(Block):
+    __slots__ = (
+        "_Input__dataset",
+        "_Input__ext_exe_prob",
+    )
+
+    def __init__(
+        self,
+        id_: str,
+        next_: List[str],
+        shares: List[float],
+        dataset: int = 0,
+        **params,
+    ):
+        """Input block. References one dataset the agent loads data from.
+
+        Args:
+            dataset (int): Index of the dataset this input draws from.
+        """
+        super().__init__(id_, c.NODE_TYPE_INPUT, next_, shares, dict(params, dataset=dataset))
+        self.__dataset = dataset
+        self.__ext_exe_prob: Optional[float] = None
+
+    @property
+    def dataset(self) -> int:
+        return self.__dataset
+
+    @property
+    def ext_exe_prob(self) -> Optional[float]:
+        return self.__ext_exe_prob
+
+    @ext_exe_prob.setter
+    def ext_exe_prob(self, prob: float) -> None:
+        self.__ext_exe_prob = prob
+
+    def __eq__(self, other) -> bool:
+        # Inputs are never deduplicated - identity semantics.
+        return self is other
+
+    def __hash__(self):
+        return object.__hash__(self)
+
+
+class Augment(Block):
+    __slots__ = (
+        "_Augment__class_name",
+        "_Augment__aug_params",
+        "_Augment__augmentation",
+        "_Augment__params_hash",
+        "_Augment__int_exe_prob",
+        "_Augment__inflation",
+        "_Augment__n_inputs",
+        "_Augment__ext_exe_prob",
+        "_Augment__prev_ext_exe_probs",
+        "_inflation_lt1",
+        "_inv_inflation_rounded",
+        "_handler",
+        "_prev_ids",
+        "_prev_probs_norm",
+    )
+
+    def __init__(
+        self,
+        id_: str,
+        next_: List[str],
+        shares: List[float],
+        class_name: str = "",
+        params: Optional[dict] = None,
+        exe_prob: float = 1.0,
+        **extra,
+    ):
+        """Augmentation block. Wraps one augmentation applied along a path.
+
+        Args:
+            class_name (str): Name of the augmentation class to execute.
+            params (dict): Keyword arguments for the augmentation class.
+            exe_prob (float): Internal probability that the augmentation is
+                applied when its block is executed.
+
+        The data inflation factor is taken from the augmentation class. Values
+        below one mean the augmentation consumes multiple inputs (e.g. 0.5 for
+        mixup).
+        """
+        aug_params = params or {}
+        augmentation_cls = augmentations.REGISTRY.get(class_name)
+        if augmentation_cls is None:
+            raise ValueError(f"Unknown augmentation '{class_name}'")
+        try:
+            augmentation = augmentation_cls(**aug_params)
+        except TypeError:
+            raise ValueError(
+                f"Invalid parameters for augmentation '{class_name}': {aug_params}"
+            )
+        inflation = augmentation.inflation
+        block_params = dict(extra, class_name=class_name, params=aug_params, exe_prob=exe_prob, inflation=inflation)
+        super().__init__(id_, c.NODE_TYPE_AUGMENT, next_, shares, block_params)
+        self.__class_name = class_name
+        self.__aug_params = aug_params
+        self.__augmentation = augmentation
+        # params piece of the content hash, stable for the block's lifetime
+        self.__params_hash = hash(
+            (class_name, tuple(sorted((key, str(value)) for key, value in aug_params.items())))
+        )
+        self.__int_exe_prob = exe_prob
+        self.__inflation = inflation
+        self.__n_inputs = int(1 / inflation) if inflation < 1 else 1
+        # cached for the per-fetch hot path in Blocks.root
+        self._inflation_lt1 = inflation < 1
+        self._inv_inflation_rounded = round(1 / inflation) if inflation < 1 else 1
+        # executor handler key, resolved once instead of per-sample branching
+        self._handler = "inflate" if inflation < 1 else "normal"
+        self.__ext_exe_prob: Optional[float] = None
+        self.__prev_ext_exe_probs: List[float] = []
+        # prev ids and normalized probabilities, cached by _calc_ext_exe_probs
+        self._prev_ids: Optional[np.ndarray] = None
+        self._prev_probs_norm: Optional[np.ndarray] = None
+
+    @property
+    def augmentation(self) -> augmentations.Augmentation:
+        return self.__augmentation
+
+    @property
+    def class_name(self) -> str:
+        return self.__class_name
+
+    @property
+    def aug_params(self) -> dict:
+        return self.__aug_params
+
+    @property
+    def int_exe_prob(self) -> float:
+        return self.__int_exe_prob
+
+    @property
+    def inflation(self) -> float:
+        return self.__inflation
+
+    @property
+    def n_inputs(self) -> int:
+        return self.__n_inputs
+
+    @property
+    def ext_exe_prob(self) -> Optional[float]:
+        return self.__ext_exe_prob
+
+    @ext_exe_prob.setter
+    def ext_exe_prob(self, prob: float) -> None:
+        self.__ext_exe_prob = prob
+
+    @property
+    def prev_ext_exe_probs(self) -> List[float]:
+        return self.__prev_ext_exe_probs
+
+    @prev_ext_exe_probs.setter
+    def prev_ext_exe_probs(self, probs: List[float]) -> None:
+        self.__prev_ext_exe_probs = probs
+
+    def __deepcopy__(self, memo):
+        """Deep copy that shares the augmentation object - it is stateless
+        after construction and expensive to rebuild."""
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        for slot in _all_slots(cls):
+            value = getattr(self, slot)
+            if slot != "_Augment__augmentation":
+                value = deepcopy(value, memo)
+            setattr(result, slot, value)
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Augment):
+            return NotImplemented
+        return (
+            self.class_name == other.class_name
+            and self.aug_params == other.aug_params
+            and self.int_exe_prob == other.int_exe_prob
+            and self.share == other.share
+            and self.next == other.next
+        )
+
+    def __hash__(self):
+        return hash((self.__params_hash, self.__int_exe_prob, self.share, tuple(self.next)))
+
+
+# category -> concrete block class; new block kinds register here
+_BLOCK_CTORS = {
+    c.NODE_TYPE_INPUT: Input,
+    c.NODE_TYPE_AUGMENT: Augment,
+}
+
+
+class Blocks:
+    def __init__(self, gen: np.random.Generator):
+        """Holds all built block variants of one blueprint.
+
+        Args:
+            gen (np.random.Generator): Generator used for all probabilistic
+                choices while fetching paths.
+        """
+        self.__gen = gen
+        self.__blocks: List[Block] = []
+        # id -> built block, mirrored with self.__blocks on every insert
+        self.__block_index: Dict[str, Block] = {}
+        # raw blueprint id -> ids of the built variants of that raw block
+        self.__variant_index: Dict[str, List[str]] = {}
+        # canonical block -> index into self.__blocks, for variant dedup
+        self.__dedup: Dict[Block, int] = {}
+        # output-block probability table, filled at the end of build()
+        self._output_blocks: List[Block] = []
+        self._output_ids: Optional[np.ndarray] = None
+        self._output_probs: Optional[np.ndarray] = None
+        # block partitions by kind, filled at the end of build()
+        self._input_blocks: List[Block] = []
+        self._augment_blocks: List[Block] = []
+        self._input_ids: set = set()
+        self._augment_ids: set = set()
+
+    @property
+    def blocks(self) -> List[Block]:
+        return self.__blocks
+
+    def __getitem__(self, id_: str) -> Block:
+        return self.__block_index[id_]
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.__block_index
+
+    def __len__(self) -> int:
+        return len(self.__blocks)
+
+    def build(self, block_dicts: List[dict]) -> None:
+        """Builds all block variants from the raw blueprint dicts and wires
+        them into a graph walkable backwards from the output blocks."""
+        raw_blocks = [dict_to_block(block_dict) for block_dict in block_dicts]
+        for raw_block in raw_blocks:
+            self._build_from_block(raw_block)
+        # hashes depend on next edges, which _wire_prev rewrites - the dedup
+        # table must not be used past this point
+        self.__dedup.clear()
+        self._wire_prev()
+        self._calc_ext_exe_probs()
+        # the output partition and its probability table are static post-build
+        self._output_blocks = self._get_output_blocks(self.__blocks)
+        self._output_ids = np.array(
+            [output_block.id for output_block in self._output_blocks], dtype=object
+        )
+        self._output_probs = np.asarray(
+            [output_block.ext_exe_prob for output_block in self._output_blocks],
+            dtype=np.float64,
+        )
+        self._output_probs /= self._output_probs.sum()
+        # block kinds are fixed post-build; cache the partitions and classify
+        # subgraphs by id set membership instead of isinstance scans
+        self._input_blocks = [block for block in self.__blocks if isinstance(block, Input)]
+        self._augment_blocks = [block for block in self.__blocks if isinstance(block, Augment)]
+        self._input_ids = {block.id for block in self._input_blocks}
+        self._augment_ids = {block.id for block in self._augment_blocks}
+
+    def fetch_path(self) -> Dict[str, Dict[str, Block]]:
+        """Samples one execution path. Returns a dict with the input blocks
+        and the augmentation blocks of the chosen path, keyed by block id."""
+        output_block = self.__block_index[
+            self.__gen.choice(self._output_ids, p=self._output_probs)
+        ]
+        return self._assemble_path(output_block)
+
+    def fetch_paths(self, n: int) -> List[Dict[str, Dict[str, Block]]]:
+        """Samples n execution paths with a single batched output-block draw.
+        Paths reference the shared immutable block topology - all per-path
+        mutable state lives with the executor."""
+        chosen_ids = self.__gen.choice(self._output_ids, p=self._output_probs, size=n)
+        return [
+            self._assemble_path(self.__block_index[chosen_id]) for chosen_id in chosen_ids
+        ]
+
+    def _assemble_path(self, output_block: Block) -> Dict[str, Dict[str, Block]]:
+        path_blocks, uses, chains = self.root(output_block)
+        input_ids = self._input_ids
+        return {
+            c.PATH_INPUTS: {
+                id_: block for id_, block in path_blocks.items() if id_ in input_ids
+            },
+            c.PATH_AUGMENTATIONS: {
+                id_: block for id_, block in path_blocks.items() if id_ not in input_ids
+            },
+            c.PATH_USES: uses,
+            c.PATH_OUTPUT: output_block.id,
+            c.PATH_CHAINS: tuple(chains),
+        }
+
+    def root(self, block: Block) -> tuple:
+        """Walks the graph backwards from block, sampling one predecessor per
+        step. Inflationary blocks sample one sub path per consumed input.
+        Returns the visited blocks, the use count per input block and the
+        sampled forward block-id chain for every data item - execution must
+        follow exactly these chains, since one path can contain several share
+        variants of the same raw block and the next edges alone cannot tell
+        which variant a given data item was drawn through."""
+        blocks = {block.id: block}
+        uses: Dict[str, int] = {}
+        chains: List[tuple] = []
+        # each stack entry carries the block to walk from plus the id trail
+        # sampled so far, recorded output-first and reversed once per chain
+        stack = deque([(block, (block.id,))])
+        while stack:
+            current, trail = stack.pop()
+            if current.is_input:
+                uses[current.id] = uses.get(current.id, 0) + 1
+                chains.append(trail[::-1])
+                continue
+            n_variants = current._inv_inflation_rounded if current._inflation_lt1 else 1
+            for _ in range(n_variants):
+                prev_ids = current._prev_ids
+                if prev_ids.shape[0] == 1:
+                    chosen_block_id = prev_ids[0]
+                else:
+                    chosen_block_id = self.__gen.choice(prev_ids, p=current._prev_probs_norm)
+                chosen_block = self.__block_index[chosen_block_id]
+                if chosen_block_id not in blocks:
+                    blocks[chosen_block_id] = chosen_block
+                stack.append((chosen_block, trail + (chosen_block_id,)))
+        return blocks, uses, chains
+
+    def _build_from_block(self, raw_block: Block) -> None:
+        """Expands one raw block into one built variant per share."""
+        variant_ids: List[str] = []
+        for share_index in range(raw_block.variations):
+            variant_id = new_id(self.__gen) if raw_block.variations > 1 else raw_block.id
+            built_block = raw_block._clone_set(variant_id, share_index)
+            duplicate_index = self.__dedup.get(built_block)
+            if duplicate_index is None:
+                self.__blocks.append(built_block)
+                self.__block_index[built_block.id] = built_block
+                self.__dedup[built_block] = len(self.__blocks) - 1
+                variant_ids.append(built_block.id)
+            else:
+                variant_ids.append(self.__blocks[duplicate_index].id)
+        self.__variant_index[raw_block.id] = variant_ids
+
+    def _wire_prev(self) -> None:
+        """Fills the prev id lists from the built next edges. Next edges still
+        reference raw blueprint ids and are rewritten to variant ids here."""
+        for block in self.__blocks:
+            if not block.next:
+                continue
+            raw_next_id = block.next[0]
+            next_variant_ids = self.__variant_index[raw_next_id]
+            block.next = list(next_variant_ids)
+            for next_variant_id in next_variant_ids:
+                next_block = self.__block_index[next_variant_id]
+                if block.id not in next_block.prev:
+                    next_block.prev.append(block.id)
+
+    def _calc_ext_exe_probs(self) -> None:
+        """Propagates external execution probabilities forward from the input
+        shares and stores the aligned predecessor probabilities per block."""
+        resolved: Dict[str, float] = {}
+        pending = list(self.__blocks)
+        while pending:
+            still_pending = []
+            for block in pending:
+                if block.is_input:
+                    block.ext_exe_prob = block.share if block.share is not None else 1.0
+                    resolved[block.id] = block.ext_exe_prob
+                    continue
+                if any(prev_id not in resolved for prev_id in block.prev):
+                    still_pending.append(block)
+                    continue
+                prev_ext_exe_probs = [resolved[prev_id] for prev_id in block.prev]
+                block.prev_ext_exe_probs = prev_ext_exe_probs
+                prev_probs_norm = np.asarray(prev_ext_exe_probs, dtype=np.float64)
+                prev_probs_norm /= prev_probs_norm.sum()
+                block._prev_ids = np.asarray(block.prev, dtype=object)
+                block._prev_probs_norm = prev_probs_norm
+                share = block.share if block.share is not None else 1.0
+                block.ext_exe_prob = sum(prev_ext_exe_probs) * share
+                resolved[block.id] = block.ext_exe_prob
+            if len(still_pending) == len(pending):
+                raise ValueError("Blueprint contains a cycle or a dangling prev reference")
+            pending = still_pending
+
+    @staticmethod
+    def _get_output_blocks(blocks: List[Block]) -> List[Block]:
+        return [block for block in blocks if block.is_output]
+
+
+def dict_to_block(block_dict: dict) -> Block:
+    """Parses one raw blueprint dict directly into its concrete block class."""
+    category = block_dict[c.BLOCK_CATEGORY]
+    try:
+        ctor = _BLOCK_CTORS[category]
+    except KeyError:
+        raise ValueError(f"Unknown block category '{category}'")
+    return ctor(
+        block_dict[c.BLOCK_ID],
+        block_dict.get(c.BLOCK_NEXT, []),
+        block_dict.get(c.BLOCK_SHARES, [1.0]),
+        **block_dict.get(c.BLOCK_PARAMS, {}),
+    )
@@ -0,0 +1,274 @@
+"""Execution of fetched paths.
+
+The executor pulls a path from the block graph, loads the input data and
+propagates every data item forward through the augmentation blocks of the
+path until it reaches the output block.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from copy import deepcopy
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import daugx.core.constants as c
+from daugx.core.agent.blocks import Augment, Blocks, Input
+from daugx.core.augmentation.annotations import Annotations
+from daugx.core.data.dataset import Dataset
+from daugx.utils.io_reader import submit_reads
+from daugx.utils.misc import transpose_image
+
+
+class Executor:
+    def __init__(
+        self,
+        blocks: Blocks,
+        datasets: List[Dataset],
+        gen: np.random.Generator,
+        backend: str = "numpy",
+    ):
+        """Executes paths fetched from the block graph.
+
+        Args:
+            blocks (Blocks): Built block graph to fetch paths from.
+            datasets (list): Datasets referenced by the input blocks.
+            gen (np.random.Generator): Generator for all probabilistic choices.
+            backend (str): numpy or cupy. With cupy, images are uploaded to
+                the device once after loading and downloaded once at the
+                output, so pure-array augmentations run on the GPU through
+                numpy's dispatch protocol. Augmentations that resample
+                through OpenCV still need host memory and do not support
+                this backend.
+        """
+        if backend == "cupy":
+            import cupy
+            self.__xp = cupy
+        elif backend == "numpy":
+            self.__xp = np
+        else:
+            raise ValueError(f"Unknown executor backend '{backend}'")
+        self.__blocks = blocks
+        self.__datasets = datasets
+        self.__gen = gen
+        # stochastic augmentations draw through the injected generator - the
+        # agent seed must cover every probabilistic choice, noise included
+        for augment_block in blocks._augment_blocks:
+            augment_block.augmentation.gen = gen
+        self.__path: Optional[Dict[str, dict]] = None
+        # data ids are ints from a monotonic counter - unique within one path
+        # execution and cheaper to hash than id strings; c.DATA_OUTPUT is the
+        # only non-int key
+        self.__data: Dict[int, Tuple[np.ndarray, Annotations]] = {}
+        self.__id_counter = 0
+        # consumers left per data id; items are only copied when a mutating
+        # augmentation touches data that still has other consumers
+        self.__refcount: Dict[int, int] = {}
+        # SoA input buffers (images, annotations) collected per inflationary
+        # block until it can fire
+        self.__pending_inputs: Dict[str, Tuple[List[np.ndarray], List[Annotations]]] = {}
+        # pre-drawn uniforms; one batched Generator.random call amortizes the
+        # per-draw overhead across thousands of execution decisions
+        self.__uniform_buf = self.__gen.random(1 << 14)
+        self.__uniform_idx = 0
+        # bound handlers keyed by the handler tag resolved on each block at
+        # build time - one dict probe replaces the per-sample branch ladder
+        self._handlers = {
+            "normal": self._exec_augment_block,
+            "inflate": self._exec_inflationary_block,
+        }
+        # specialized execution plans per path topology; paths repeat across
+        # fetches, so the per-step next-block resolution is paid once
+        self.__plan_cache: Dict[tuple, dict] = {}
+        # inputs resolved ahead of execution by fetch_batch, in the exact
+        # order _execute_path consumes them; (dataset index, sample index,
+        # raw file bytes) per input draw
+        self.__prefetched: Deque[Tuple[int, int, bytes]] = deque()
+
+    def fetch(self, path: Optional[dict] = None) -> Tuple[np.ndarray, Annotations]:
+        """Fetches one augmented sample. The returned CHW image is a strided
+        view and may be non-contiguous.
+
+        Args:
+            path (dict): Pre-sampled path to execute. Sampled internally when
+                omitted. Paths only reference the immutable block topology -
+                all mutable execution state is scratch local to this call.
+        """
+        if path is None:
+            path = self.__blocks.fetch_path()
+        self.__path = path
+        self._execute_path()
+        image, annotations = self.__data[c.DATA_OUTPUT]
+        self._reset()
+        if self.__xp is not np:
+            image = self.__xp.asnumpy(image)
+        return transpose_image(image), annotations
+
+    def fetch_batch(self, n: int) -> List[Tuple[np.ndarray, Annotations]]:
+        """Fetches n augmented samples, sampling all paths in one batched
+        draw and reading all their input images with overlapping I/O before
+        executing the paths."""
+        paths = self.__blocks.fetch_paths(n)
+        self._prefetch_inputs(paths)
+        return [self.fetch(path) for path in paths]
+
+    def _prefetch_inputs(self, paths: List[dict]) -> None:
+        """Resolves every input draw of the batch up front and hands all
+        image paths to the threaded reader in one submission, so cold reads
+        overlap instead of serializing one imread per input. The draws land
+        in the prefetch queue in execution order - _exec_input_block consumes
+        them one by one."""
+        draws = []
+        for path in paths:
+            input_blocks = path[c.PATH_INPUTS]
+            for chain in path[c.PATH_CHAINS]:
+                dataset = input_blocks[chain[0]].dataset
+                index = self.__datasets[dataset].draw_index(self.__gen)
+                draws.append((dataset, index))
+        contents = submit_reads(
+            [self.__datasets[dataset].image_path(index) for dataset, index in draws]
+        )
+        self.__prefetched.extend(
+            (dataset, index, image_bytes)
+            for (dataset, index), image_bytes in zip(draws, contents)
+        )
+
+    def _execute_path(self) -> None:
+        """Runs the path along its specialized plan: per data item a frozen
+        tuple of (handler, block) steps, resolved once per chain topology and
+        reused across fetches. Each data item walks its step chain until an
+        inflationary block swallows it or it lands on the output."""
+        plan = self._get_plan()
+        data = self.__data
+        refcount = self.__refcount
+        for input_block, steps in plan:
+            data_id = self._next_id()
+            data[data_id] = self._exec_input_block(input_block)
+            refcount[data_id] = 1
+            for handler, block in steps:
+                data_id = handler(block, data_id)
+                if data_id is None:
+                    break
+            else:
+                data[c.DATA_OUTPUT] = data[data_id]
+
+    def _get_plan(self) -> tuple:
+        """Returns the execution plan of the current path, compiling and
+        caching it on first sight of the sampled chains."""
+        key = self.__path[c.PATH_CHAINS]
+        plan = self.__plan_cache.get(key)
+        if plan is None:
+            plan = self._compile_plan()
+            self.__plan_cache[key] = plan
+        return plan
+
+    def _compile_plan(self) -> tuple:
+        """Specializes the sampled block-id chains into per-data-item step
+        tuples, burning the block lookup and handler dispatch in. The chains
+        come from the path sampler - re-deriving routing from the next edges
+        would conflate share variants of the same raw block when both appear
+        in one path."""
+        augment_blocks = self.__path[c.PATH_AUGMENTATIONS]
+        input_blocks = self.__path[c.PATH_INPUTS]
+        plan = []
+        for chain in self.__path[c.PATH_CHAINS]:
+            steps = tuple(
+                (self._handlers[augment_blocks[block_id]._handler], augment_blocks[block_id])
+                for block_id in chain[1:]
+            )
+            plan.append((input_blocks[chain[0]], steps))
+        return tuple(plan)
+
+    def _exec_input_block(self, block: Input) -> Tuple[np.ndarray, Annotations]:
+        if self.__prefetched:
+            # the queue mirrors execution order, so the front entry is this
+            # block's draw with its file content already read
+            dataset, index, image_bytes = self.__prefetched.popleft()
+            image, annotations = self.__datasets[dataset].load(index, image_bytes)
+        else:
+            image, annotations = self.__datasets[block.dataset].fetch(self.__gen)
+        if self.__xp is not np:
+            image = self.__xp.asarray(image)
+        return image, annotations
+
+    def _exec_augment_block(self, block: Augment, data_id: int) -> Optional[int]:
+        new_data_id = self._next_id()
+        if self._draw_uniform() < block.int_exe_prob:
+            image, annotations = self._claim(data_id, mutating=block.augmentation.inplace)
+            image, annotations = block.augmentation.apply(image, annotations)
+            self.__data[new_data_id] = (self._canonicalize_dtype(image), annotations)
+        else:
+            # probabilistic skip: forward the data under its new id, no copy
+            self.__data[new_data_id] = self._claim(data_id, mutating=False)
+        self.__refcount[new_data_id] = 1
+        return new_data_id
+
+    def _exec_inflationary_block(self, block: Augment, data_id: int) -> Optional[int]:
+        """Collects inputs in per-block SoA buffers until the block has
+        enough to fire. The block itself stays immutable."""
+        image, annotations = self._claim(data_id, mutating=block.augmentation.inplace)
+        image_buf, annotation_buf = self.__pending_inputs.setdefault(block.id, ([], []))
+        image_buf.append(image)
+        annotation_buf.append(annotations)
+        if len(image_buf) < block.n_inputs:
+            return None
+        # hand equally sized inputs over as one contiguous NxHxWxC batch so
+        # the augmentation can run vectorized over it
+        first_shape = image_buf[0].shape
+        if all(img.shape == first_shape for img in image_buf):
+            images = np.stack(image_buf)
+        else:
+            images = image_buf
+        new_data_id = self._next_id()
+        image, merged = block.augmentation.apply(images, annotation_buf)
+        self.__data[new_data_id] = (self._canonicalize_dtype(image), merged)
+        self.__refcount[new_data_id] = 1
+        del self.__pending_inputs[block.id]
+        return new_data_id
+
+    def _next_id(self) -> int:
+        self.__id_counter += 1
+        return self.__id_counter
+
+    @staticmethod
+    def _canonicalize_dtype(image: np.ndarray) -> np.ndarray:
+        """Enforces the uint8 invariant between blocks. Augmentations that
+        compute in float upcast locally; letting a float image cross a block
+        boundary would quadruple the bytes moved by every later block."""
+        if image.dtype == np.uint8:
+            return image
+        return image.astype(np.uint8)
+
+    def _draw_uniform(self) -> float:
+        """Returns one uniform draw from the pre-drawn buffer, refilling it
+        when exhausted."""
+        if self.__uniform_idx == self.__uniform_buf.shape[0]:
+            self.__uniform_buf = self.__gen.random(1 << 14)
+            self.__uniform_idx = 0
+        value = self.__uniform_buf[self.__uniform_idx]
+        self.__uniform_idx += 1
+        return value
+
+    def _claim(self, data_id: int, mutating: bool) -> Tuple[np.ndarray, Annotations]:
+        """Hands one data item to its next consumer. The item is only copied
+        when it is about to be mutated while other consumers still hold it -
+        the last (or only) consumer takes ownership without any copy."""
+        count = self.__refcount[data_id]
+        data = self.__data[data_id]
+        if count == 1:
+            del self.__data[data_id]
+            del self.__refcount[data_id]
+            return data
+        self.__refcount[data_id] = count - 1
+        if mutating:
+            image, annotations = data
+            return image.copy(), deepcopy(annotations)
+        return data
+
+    def _reset(self) -> None:
+        self.__data = {}
+        self.__refcount = {}
+        self.__pending_inputs = {}
+        self.__id_counter = 0
+        self.__path = None
@@ -0,0 +1,147 @@
+"""Dataset filters dropping annotations by metadata at load time.
+
+Filter expressions come from the dataset config as strings like
+``"area > 100 and label != 3"``. A parsed expression becomes a
+``FilterSequence`` which folds all predicates into flat numpy arrays and
+evaluates them over the annotation features of a whole image in one pass.
+When numba is available the pass is jit-compiled.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+from daugx.core.augmentation.annotations import Annotations
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# feature column per filterable field
+FIELDS = {"area": 0, "width": 1, "height": 2, "label": 3}
+COMPARATORS = {">": 0, "<": 1, ">=": 2, "<=": 3, "==": 4, "!=": 5}
+COMBINATORS = {"and": 0, "or": 1}
+
+
+def _evaluate(features, fields, comparators, thresholds, combinators, out):
+    for i in range(features.shape[0]):
+        result = False
+        for j in range(fields.shape[0]):
+            value = features[i, fields[j]]
+            comparator = comparators[j]
+            if comparator == 0:
+                passed = value > thresholds[j]
+            elif comparator == 1:
+                passed = value < thresholds[j]
+            elif comparator == 2:
+                passed = value >= thresholds[j]
+            elif comparator == 3:
+                passed = value <= thresholds[j]
+            elif comparator == 4:
+                passed = value == thresholds[j]
+            else:
+                passed = value != thresholds[j]
+            if j == 0:
+                result = passed
+            elif combinators[j - 1] == 0:
+                result = result and passed
+            else:
+                result = result or passed
+        out[i] = result
+
+
+_evaluate_jit = njit(cache=True, fastmath=True)(_evaluate) if njit is not None else None
+
+
+class Filter:
+    def __init__(self, field: str, comparator: str, threshold: float):
+        """One predicate over a single annotation feature.
+
+        Args:
+            field (str): Feature to compare - area, width, height or label.
+            comparator (str): One of >, <, >=, <=, ==, !=.
+            threshold (float): Value to compare against.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown filter field '{field}'")
+        if comparator not in COMPARATORS:
+            raise ValueError(f"Unknown filter comparator '{comparator}'")
+        self.field = field
+        self.comparator = comparator
+        self.threshold = float(threshold)
+
+    def __repr__(self) -> str:
+        return f"Filter({self.field} {self.comparator} {self.threshold})"
+
+
+class FilterSequence:
+    def __init__(self, filters: List[Filter], combinators: List[str]):
+        """Chain of filters joined left to right by and/or combinators.
+
+        Args:
+            filters (list): Parsed filters.
+            combinators (list): One combinator between each filter pair.
+        """
+        if len(combinators) != len(filters) - 1:
+            raise ValueError("Expected one combinator between each filter pair")
+        self.filters = filters
+        self.combinators = combinators
+        # folded representation consumed by the evaluation kernel
+        self.__fields = np.array([FIELDS[f.field] for f in filters], dtype=np.int8)
+        self.__comparators = np.array(
+            [COMPARATORS[f.comparator] for f in filters], dtype=np.int8
+        )
+        self.__thresholds = np.array([f.threshold for f in filters], dtype=np.float32)
+        self.__combinators = np.array([COMBINATORS[comb] for comb in combinators], dtype=np.int8)
+
+    @classmethod
+    def from_string(cls, expression: str) -> "FilterSequence":
+        """Parses an expression like "area > 100 and label != 3"."""
+        tokens = expression.split()
+        if len(tokens) < 3 or (len(tokens) - 3) % 4 != 0:
+            raise ValueError(f"Malformed filter expression '{expression}'")
+        filters = [Filter(tokens[0], tokens[1], float(tokens[2]))]
+        combinators = []
+        for i in range(3, len(tokens), 4):
+            if tokens[i] not in COMBINATORS:
+                raise ValueError(f"Unknown filter combinator '{tokens[i]}'")
+            combinators.append(tokens[i])
+            filters.append(Filter(tokens[i + 1], tokens[i + 2], float(tokens[i + 3])))
+        return cls(filters, combinators)
+
+    def evaluate(self, features: np.ndarray) -> np.ndarray:
+        """Evaluates the sequence over an (n, 4) feature array and returns a
+        boolean keep-mask."""
+        out = np.empty(features.shape[0], dtype=np.bool_)
+        kernel = _evaluate_jit if _evaluate_jit is not None else _evaluate
+        kernel(
+            features,
+            self.__fields,
+            self.__comparators,
+            self.__thresholds,
+            self.__combinators,
+            out,
+        )
+        return out
+
+    def apply(self, annotations: Annotations) -> None:
+        """Drops all annotations that do not pass the sequence."""
+        if not annotations.annots:
+            return
+        features = np.empty((len(annotations.annots), 4), dtype=np.float32)
+        for i, annot in enumerate(annotations.annots):
+            dims = annot.boundary.max(axis=0) - annot.boundary.min(axis=0)
+            features[i, 0] = annot.area
+            features[i, 1] = dims[0]
+            features[i, 2] = dims[1]
+            features[i, 3] = annot.label.id
+        mask = self.evaluate(features)
+        annotations.annots = [
+            annot for annot, keep in zip(annotations.annots, mask) if keep
+        ]
+
+    def __repr__(self) -> str:
+        return f"FilterSequence(n={len(self.filters)})"
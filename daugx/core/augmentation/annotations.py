@@ -0,0 +1,618 @@
+"""Annotation containers carried through the augmentation pipeline.
+
+An ``Annotations`` object belongs to one image and holds one ``Annotation``
+per labeled object. Geometric augmentations mutate the annotation boundaries
+through the methods on ``Annotations`` so image and labels stay aligned.
+"""
+
+from __future__ import annotations
+
+import inspect
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from daugx.core.augmentation import boundaries
+from daugx.utils.misc import new_id
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+BOUNDARY_NAME = "Boundary"
+
+# boundary type prefix -> class, resolved once at import time; getmembers
+# walks and sorts the whole module dict, far too much work per annotation
+_BOUNDARY_CLS_BY_TYPE = {
+    name[: -len(BOUNDARY_NAME)]: obj
+    for name, obj in inspect.getmembers(boundaries, inspect.isclass)
+    if name.endswith(BOUNDARY_NAME) and name != BOUNDARY_NAME
+}
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _border_kernel(points, offsets, x_min, y_min, x_max, y_max, valid):
+        """Fused cut/clamp/rebase over the gathered point buffer: marks
+        segments fully outside the region invalid, clamps the rest into it
+        and shifts them onto the new origin."""
+        for i in range(offsets.shape[0] - 1):
+            start = offsets[i]
+            end = offsets[i + 1]
+            below = True
+            for j in range(start, end):
+                if points[j, 0] >= x_min and points[j, 1] >= y_min:
+                    below = False
+                    break
+            if below:
+                valid[i] = False
+                continue
+            for j in range(start, end):
+                if points[j, 0] < x_min:
+                    points[j, 0] = x_min
+                if points[j, 1] < y_min:
+                    points[j, 1] = y_min
+            above = True
+            for j in range(start, end):
+                if points[j, 0] <= x_max and points[j, 1] <= y_max:
+                    above = False
+                    break
+            if above:
+                valid[i] = False
+                continue
+            for j in range(start, end):
+                if points[j, 0] > x_max:
+                    points[j, 0] = x_max
+                if points[j, 1] > y_max:
+                    points[j, 1] = y_max
+                points[j, 0] -= x_min
+                points[j, 1] -= y_min
+
+    @njit(cache=True)
+    def _affine_kernel(points, a, b, c, d, tx, ty, x_max, y_max, clip):
+        """Fused affine transform and border clamp over the gathered point
+        buffer - one pass over memory instead of separate matmul, shift and
+        clip passes."""
+        for i in range(points.shape[0]):
+            x = points[i, 0]
+            y = points[i, 1]
+            new_x = a * x + b * y + tx
+            new_y = c * x + d * y + ty
+            if clip:
+                if new_x < 0.0:
+                    new_x = 0.0
+                elif new_x > x_max:
+                    new_x = x_max
+                if new_y < 0.0:
+                    new_y = 0.0
+                elif new_y > y_max:
+                    new_y = y_max
+            points[i, 0] = new_x
+            points[i, 1] = new_y
+
+else:
+    _border_kernel = None
+    _affine_kernel = None
+
+
+@lru_cache(maxsize=256)
+def _compose_transf_mat(
+    scale: Optional[Tuple[float, float]],
+    angle: Optional[float],
+    translation: Optional[Tuple[float, float]],
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """Builds the composed translation @ rotation @ scale matrix directly
+    from the parameters that are set - no identity factors, no chained
+    matmuls. Returned matrices are cached and therefore read-only; they are
+    float32 so products with the float32 boundary buffers stay narrow."""
+    mat = np.identity(3, dtype=np.float32)
+    if translation is not None:
+        mat[0, 2] = translation[0]
+        mat[1, 2] = translation[1]
+    if angle is not None:
+        rad = np.deg2rad(angle)
+        cos, sin = np.cos(rad), np.sin(rad)
+        cx, cy = width / 2, height / 2
+        rot_mat = np.array(
+            [
+                [cos, -sin, cx - cos * cx + sin * cy],
+                [sin, cos, cy - sin * cx - cos * cy],
+                [0, 0, 1],
+            ],
+            dtype=np.float32,
+        )
+        mat = mat @ rot_mat
+    if scale is not None:
+        # right-multiplying by diag(sx, sy, 1) scales the first two columns
+        mat[:, 0] *= scale[0]
+        mat[:, 1] *= scale[1]
+    mat.flags.writeable = False
+    return mat
+
+
+class Label:
+    def __init__(self, id_: int, name: str):
+        self.id = id_
+        self.name = name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Label):
+            return NotImplemented
+        return self.id == other.id and self.name == other.name
+
+    def __hash__(self):
+        return hash((self.id, self.name))
+
+    def __repr__(self) -> str:
+        return f"Label(id={self.id}, name='{self.name}')"
+
+
+class Annotation:
+    def __init__(self, boundary: np.ndarray, label: Label, boundary_type: str = "Box"):
+        """One labeled object of an image.
+
+        Args:
+            boundary (np.ndarray): Points spanning the object boundary.
+            label (Label): Label of the object.
+            boundary_type (str): Boundary class prefix - Box, Polygon or KeyPoint.
+        """
+        self.id = new_id()
+        self.label = label
+        self.valid = True
+        self.boundary_type = boundary_type
+        boundary_cls = _BOUNDARY_CLS_BY_TYPE.get(boundary_type)
+        if boundary_cls is None:
+            raise ValueError(f"Unknown boundary type '{boundary_type}'")
+        self.__boundary = boundary_cls(boundary)
+        # lazily computed pure getters, invalidated on every boundary write
+        self._area_cache: Optional[float] = None
+        self._center_cache: Optional[np.ndarray] = None
+        self._size_cache: Optional[float] = None
+        self._pos_cache: Optional[Tuple[float, float]] = None
+
+    @property
+    def boundary(self) -> np.ndarray:
+        return self.__boundary.points
+
+    @property
+    def size(self) -> float:
+        if self._size_cache is None:
+            self._size_cache = self._get_size()
+        return self._size_cache
+
+    @property
+    def pos(self) -> Tuple[float, float]:
+        if self._pos_cache is None:
+            self._pos_cache = self._get_pos()
+        return self._pos_cache
+
+    @property
+    def area(self) -> float:
+        if self._area_cache is None:
+            self._area_cache = self.__boundary.area
+        return self._area_cache
+
+    @property
+    def center(self) -> np.ndarray:
+        if self._center_cache is None:
+            self._center_cache = self.__boundary.center
+        return self._center_cache
+
+    def set_boundary(self, boundary: np.ndarray, boundary_type: Optional[str] = None) -> None:
+        """Replaces the boundary and re-derives all dependent attributes.
+        Updates in place - id, label and validity are kept."""
+        if boundary_type is not None and boundary_type != self.boundary_type:
+            boundary_cls = _BOUNDARY_CLS_BY_TYPE.get(boundary_type)
+            if boundary_cls is None:
+                raise ValueError(f"Unknown boundary type '{boundary_type}'")
+            self.boundary_type = boundary_type
+            self.__boundary = boundary_cls(boundary)
+        else:
+            # same type - write into the existing boundary object and let
+            # normalize re-establish its invariant, instead of running the
+            # constructor (and its array coercion) again per call
+            self.__boundary.points = np.asarray(boundary, dtype=np.float32)
+            self.__boundary.normalize()
+        self._refresh()
+
+    def shift(self, x: float, y: float) -> None:
+        self.__boundary.shift(x, y)
+        self._refresh()
+
+    def scale(self, x: float, y: float) -> None:
+        self.__boundary.scale(x, y)
+        self._refresh()
+
+    def rotate(self, angle: float, center: np.ndarray) -> None:
+        self.__boundary.rotate(angle, center)
+        self._refresh()
+
+    def clip(self, x_min: float, y_min: float, x_max: float, y_max: float) -> None:
+        self.__boundary.clip(x_min, y_min, x_max, y_max)
+        self._refresh()
+        if self.size == 0:
+            self.valid = False
+
+    def cut_min(self, new_min: Tuple[float, float]) -> None:
+        """Cuts all points to new_min. Invalidates the annotation when every
+        point lies outside of the cut."""
+        new_min = np.asarray(new_min)
+        if bool((self.boundary < new_min).any(axis=1).all()):
+            self.valid = False
+            return
+        self.set_boundary(np.maximum(self.boundary, new_min))
+
+    def cut_max(self, new_max: Tuple[float, float]) -> None:
+        """Cuts all points to new_max. Invalidates the annotation when every
+        point lies outside of the cut."""
+        new_max = np.asarray(new_max)
+        if bool((self.boundary > new_max).any(axis=1).all()):
+            self.valid = False
+            return
+        self.set_boundary(np.minimum(self.boundary, new_max))
+
+    def _get_size(self) -> float:
+        extent = self.boundary.max(axis=0) - self.boundary.min(axis=0)
+        return float(extent[0] * extent[1])
+
+    def _get_pos(self) -> Tuple[float, float]:
+        mins = self.boundary.min(axis=0)
+        return float(mins[0]), float(mins[1])
+
+    def _refresh(self) -> None:
+        self._area_cache = None
+        self._center_cache = None
+        self._size_cache = None
+        self._pos_cache = None
+
+    def _assign_points(
+        self, points: np.ndarray, size: float, pos: Tuple[float, float], normalize: bool = False
+    ) -> None:
+        """Fast-path write used by the vectorized Annotations transforms:
+        installs new boundary points together with already computed stats,
+        skipping the per-annotation reductions of _refresh."""
+        self.__boundary.points = points
+        if normalize:
+            self.__boundary.normalize()
+        self._area_cache = None
+        self._center_cache = None
+        self._size_cache = size
+        self._pos_cache = pos
+
+    def pin_memory(self) -> "Annotation":
+        """Replaces the boundary points with a pinned torch tensor. Terminal -
+        the annotation must not be augmented afterwards."""
+        import torch
+
+        self.__boundary.points = torch.from_numpy(
+            np.ascontiguousarray(self.__boundary.points)
+        ).pin_memory()
+        return self
+
+    def __repr__(self) -> str:
+        return f"Annotation(id='{self.id}', label={self.label})"
+
+
+class Annotations:
+    def __init__(self, width: int, height: int):
+        """All annotations of one image.
+
+        Args:
+            width (int): Image width in pixels.
+            height (int): Image height in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.annots: List[Annotation] = []
+        # reusable homogeneous-point buffer for transf, grown on demand
+        self._scratch: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.annots)
+
+    def __iter__(self):
+        return iter(self.annots)
+
+    def add(
+        self,
+        boundary: np.ndarray,
+        label_id: int,
+        label_name: str,
+        boundary_type: str = "Box",
+    ) -> None:
+        self.annots.append(Annotation(boundary, Label(label_id, label_name), boundary_type))
+
+    def remove(self, annot: Annotation) -> None:
+        self.annots.remove(annot)
+
+    def extend(self, other: "Annotations") -> None:
+        self.annots.extend(other.annots)
+
+    def clean(self) -> None:
+        """Drops all annotations invalidated by previous operations."""
+        self.annots = [annot for annot in self.annots if annot.valid]
+
+    def filter(
+        self,
+        min_size: Optional[float] = None,
+        max_pos: Optional[Tuple[float, float]] = None,
+        drop_labels: Optional[List[Any]] = None,
+    ) -> None:
+        """Invalidates and drops annotations by size, position or label.
+
+        Args:
+            min_size (float): Minimal spanned area an annotation must keep.
+            max_pos (tuple): Maximal allowed x/y position of an annotation.
+            drop_labels (list): Label ids or names to drop.
+        """
+        annots = self.annots
+        if not annots:
+            return
+        keep = np.fromiter((annot.valid for annot in annots), np.bool_, count=len(annots))
+        if min_size is not None:
+            sizes = np.fromiter(
+                (annot.size for annot in annots), np.float64, count=len(annots)
+            )
+            keep &= sizes >= min_size
+        if max_pos is not None:
+            poses = np.array([annot.pos for annot in annots])
+            keep &= ~(poses > np.asarray(max_pos)).any(axis=1)
+        if drop_labels is not None:
+            # label sets mix ids and names - membership stays a Python check
+            drop = set(drop_labels)
+            for i, annot in enumerate(annots):
+                if keep[i] and (annot.label.id in drop or annot.label.name in drop):
+                    keep[i] = False
+        self.annots = [annot for annot, keep_it in zip(annots, keep) if keep_it]
+
+    def _gather_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatenates all boundary points into one (total, 2) float32
+        buffer plus segment offsets - the flat layout the vectorized
+        transforms operate on."""
+        counts = [len(annot.boundary) for annot in self.annots]
+        offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        points = np.concatenate([annot.boundary for annot in self.annots], axis=0)
+        return points, offsets
+
+    def _scatter_points(
+        self, points: np.ndarray, offsets: np.ndarray, clipped: bool = False
+    ) -> None:
+        """Writes the transformed buffer back as per-annotation segments and
+        refreshes size/pos from one pair of vectorized segment reductions.
+        Segments are views into the shared buffer; boundary mutators rebind
+        their array instead of writing in place, so sharing is safe."""
+        starts = offsets[:-1]
+        mins = np.minimum.reduceat(points, starts, axis=0)
+        maxs = np.maximum.reduceat(points, starts, axis=0)
+        sizes = (maxs[:, 0] - mins[:, 0]) * (maxs[:, 1] - mins[:, 1])
+        for i, annot in enumerate(self.annots):
+            annot._assign_points(
+                points[starts[i]:offsets[i + 1]],
+                float(sizes[i]),
+                (float(mins[i, 0]), float(mins[i, 1])),
+            )
+            if clipped and annot.size == 0:
+                annot.valid = False
+
+    def _gather_hull_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Like _gather_points, but box boundaries contribute all four
+        corners - an affine map must produce the hull of the box, not the
+        hull of its stored diagonal."""
+        counts = []
+        segments = []
+        for annot in self.annots:
+            boundary = annot.boundary
+            if annot.boundary_type == "Box":
+                segments.append(
+                    np.array(
+                        [
+                            [boundary[0, 0], boundary[0, 1]],
+                            [boundary[1, 0], boundary[0, 1]],
+                            [boundary[1, 0], boundary[1, 1]],
+                            [boundary[0, 0], boundary[1, 1]],
+                        ]
+                    )
+                )
+                counts.append(4)
+            else:
+                segments.append(boundary)
+                counts.append(len(boundary))
+        offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        return np.concatenate(segments, axis=0), offsets
+
+    def _scatter_hull_points(
+        self, points: np.ndarray, offsets: np.ndarray, clipped: bool = False
+    ) -> None:
+        """Counterpart of _gather_hull_points: collapses each box corner quad
+        back to its axis-aligned extent through the segment reductions and
+        hands every other boundary type its segment view."""
+        starts = offsets[:-1]
+        mins = np.minimum.reduceat(points, starts, axis=0)
+        maxs = np.maximum.reduceat(points, starts, axis=0)
+        sizes = (maxs[:, 0] - mins[:, 0]) * (maxs[:, 1] - mins[:, 1])
+        for i, annot in enumerate(self.annots):
+            if annot.boundary_type == "Box":
+                segment = np.stack((mins[i], maxs[i]))
+            else:
+                segment = points[starts[i]:offsets[i + 1]]
+            annot._assign_points(
+                segment, float(sizes[i]), (float(mins[i, 0]), float(mins[i, 1]))
+            )
+            if clipped and annot.size == 0:
+                annot.valid = False
+
+    def shift(self, x: float, y: float) -> None:
+        if not self.annots:
+            return
+        self._apply_affine(1.0, 0.0, 0.0, 1.0, x, y)
+        self.clean()
+
+    def scale(self, x: float, y: float) -> None:
+        if self.annots:
+            self._apply_affine(x, 0.0, 0.0, y, 0.0, 0.0, clip=False)
+        self.width = int(self.width * x)
+        self.height = int(self.height * y)
+
+    def affine(self, affine_mat: np.ndarray) -> None:
+        """Applies a composed 2x3 affine matrix to all annotations in one
+        pass - compound shift/scale/rotate augmentations compose their matrix
+        once instead of running each step over the points separately."""
+        if not self.annots:
+            return
+        self._apply_affine(
+            float(affine_mat[0, 0]), float(affine_mat[0, 1]),
+            float(affine_mat[1, 0]), float(affine_mat[1, 1]),
+            float(affine_mat[0, 2]), float(affine_mat[1, 2]),
+        )
+        self.clean()
+
+    def rotate(self, angle: float) -> None:
+        """Rotates all annotations around the image center."""
+        if not self.annots:
+            return
+        cx, cy = self.width / 2, self.height / 2
+        rad = np.deg2rad(angle)
+        cos, sin = np.cos(rad), np.sin(rad)
+        self._apply_affine(
+            cos, -sin, sin, cos,
+            cx - cos * cx + sin * cy,
+            cy - sin * cx - cos * cy,
+        )
+        self.clean()
+
+    def _apply_affine(
+        self, a: float, b: float, c: float, d: float, tx: float, ty: float,
+        clip: bool = True,
+    ) -> None:
+        """Applies the 2x3 affine [[a, b, tx], [c, d, ty]] to all boundary
+        points, fused with the border clamp in one kernel pass when numba is
+        available. Boxes go through their corner quads like in transf, so
+        rotations yield the hull of the rotated box."""
+        points, offsets = self._gather_hull_points()
+        if _affine_kernel is not None:
+            _affine_kernel(
+                points, a, b, c, d, tx, ty, float(self.width), float(self.height), clip
+            )
+        else:
+            points = points @ np.array([[a, c], [b, d]], dtype=points.dtype)
+            points += np.array([tx, ty], dtype=points.dtype)
+            if clip:
+                np.clip(points, (0.0, 0.0), (self.width, self.height), out=points)
+        self._scatter_hull_points(points, offsets, clipped=clip)
+
+    def border(self, x_min: float, x_max: float, y_min: float, y_max: float) -> None:
+        """Crops all annotations to the given region and rebases them onto the
+        new image origin."""
+        assert x_max > x_min >= 0 and y_max > y_min >= 0
+        if self.annots:
+            points, offsets = self._gather_points()
+            valid = np.ones(len(self.annots), dtype=np.bool_)
+            if _border_kernel is not None:
+                _border_kernel(points, offsets, x_min, y_min, x_max, y_max, valid)
+            else:
+                # segments with every point outside the region die; the rest
+                # are clamped into it and rebased in two array passes
+                starts = offsets[:-1]
+                outside = (points[:, 0] < x_min) | (points[:, 1] < y_min)
+                valid &= ~np.logical_and.reduceat(outside, starts)
+                outside = (points[:, 0] > x_max) | (points[:, 1] > y_max)
+                valid &= ~np.logical_and.reduceat(outside, starts)
+                np.clip(points, (x_min, y_min), (x_max, y_max), out=points)
+                points -= (x_min, y_min)
+            self._scatter_points(points, offsets)
+            for annot, keep in zip(self.annots, valid):
+                if not keep:
+                    annot.valid = False
+        self.width = int(x_max - x_min)
+        self.height = int(y_max - y_min)
+        self.clean()
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """All annotation extents as one (n, 4) float32 array of
+        x_min, y_min, x_max, y_max rows - the columnar view vectorized
+        augmentations operate on instead of looping over objects."""
+        boxes = np.empty((len(self.annots), 4), dtype=np.float32)
+        for i, annot in enumerate(self.annots):
+            boundary = annot.boundary
+            boxes[i, :2] = boundary.min(axis=0)
+            boxes[i, 2:] = boundary.max(axis=0)
+        return boxes
+
+    @property
+    def labels(self) -> np.ndarray:
+        """All label ids as one (n,) int32 array."""
+        return np.fromiter(
+            (annot.label.id for annot in self.annots), dtype=np.int32, count=len(self.annots)
+        )
+
+    def set_boxes(self, boxes: np.ndarray) -> None:
+        """Writes transformed (n, 4) box extents back onto the annotations,
+        the inverse of the boxes accessor."""
+        for annot, box in zip(self.annots, boxes):
+            annot.set_boundary(np.array([[box[0], box[1]], [box[2], box[3]]], dtype=np.float32))
+
+    def pin_memory(self) -> "Annotations":
+        """Pins all boundary arrays in page-locked host memory so a PyTorch
+        DataLoader with pin_memory=True can move them to the device with
+        non_blocking copies. Terminal - call only on fetched samples."""
+        for annot in self.annots:
+            annot.pin_memory()
+        return self
+
+    def transf(self, transf_mat: np.ndarray) -> None:
+        """Applies a 3x3 homogeneous transformation matrix to all boundaries.
+
+        All boundary points go through one homogeneous buffer and one matrix
+        product instead of a per-annotation einsum - the N small GEMV calls
+        collapse into a single BLAS GEMM over the gathered points. Box
+        boundaries contribute all four corners, so a rotation yields the
+        axis-aligned hull of the rotated box instead of the hull of its two
+        stored corners."""
+        if not self.annots:
+            return
+        points, offsets = self._gather_hull_points()
+        n_points = points.shape[0]
+        if self._scratch is None or self._scratch.shape[0] < n_points:
+            # ones column is set once - the buffer is only ever read below it
+            self._scratch = np.empty((max(n_points, 64), 3), dtype=np.float32)
+            self._scratch[:, 2] = 1.0
+        homog = self._scratch[:n_points]
+        homog[:, :2] = points
+        out = self._unscale(homog @ np.asarray(transf_mat, dtype=points.dtype).T)
+        self._scatter_hull_points(out, offsets)
+
+    def get_transf_mat(
+        self,
+        scale: Optional[Tuple[float, float]] = None,
+        angle: Optional[float] = None,
+        translation: Optional[Tuple[float, float]] = None,
+    ) -> np.ndarray:
+        """Composes a 3x3 transformation matrix from scale, rotation (degrees,
+        around the image center) and translation.
+
+        Composition is memoized per parameter combination - augmentation
+        policies reuse the same values across a batch, so repeated calls
+        return the cached matrix instead of recomposing it."""
+        return _compose_transf_mat(
+            tuple(scale) if scale is not None else None,
+            angle,
+            tuple(translation) if translation is not None else None,
+            self.width,
+            self.height,
+        )
+
+    @staticmethod
+    def _unscale(scaled_points: np.ndarray) -> np.ndarray:
+        """Projects homogeneous points back onto the image plane."""
+        return scaled_points[:, :2] / scaled_points[:, 2:3]
+
+    def __repr__(self) -> str:
+        return f"Annotations(n={len(self.annots)}, width={self.width}, height={self.height})"
@@ -0,0 +1,233 @@
+"""Augmentation classes executed along a path.
+
+Every augmentation exposes ``apply(image, annotations)`` and returns the
+transformed pair. Inflationary augmentations (``inflation`` < 1) receive lists
+of images and annotations and merge them into one sample.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from daugx.core.augmentation.annotations import Annotations
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _require_cv2() -> None:
+    if cv2 is None:
+        raise ImportError("opencv-python is required for image resampling augmentations")
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mixup_blend(first, second, alpha):
+        out = np.empty(first.shape, dtype=np.uint8)
+        flat_first = first.reshape(-1)
+        flat_second = second.reshape(-1)
+        flat_out = out.reshape(-1)
+        beta = 1.0 - alpha
+        for i in prange(flat_first.shape[0]):
+            flat_out[i] = np.uint8(flat_first[i] * alpha + flat_second[i] * beta)
+        return out
+
+else:
+    _mixup_blend = None
+
+
+class Augmentation:
+    """Base class of all augmentations.
+
+    apply() receives and must return uint8 images; work that needs float
+    precision upcasts locally and clips back before returning.
+    """
+
+    inflation = 1.0
+    # whether apply() may mutate its inputs (all current augmentations mutate
+    # the annotations in place); the executor copies shared data accordingly
+    inplace = True
+    # seeded generator injected by the executor; stochastic augmentations
+    # must draw from it so seeded runs stay reproducible
+    gen: "np.random.Generator" = None
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class Flip(Augmentation):
+    def __init__(self, direction: str = "horizontal"):
+        """Mirrors the image along one axis.
+
+        Args:
+            direction (str): horizontal or vertical.
+        """
+        if direction not in ("horizontal", "vertical"):
+            raise ValueError(f"Unknown flip direction '{direction}'")
+        self.direction = direction
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        if self.direction == "horizontal":
+            image = np.fliplr(image)
+            mat = np.array([[-1, 0, annotations.width], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+        else:
+            image = np.flipud(image)
+            mat = np.array([[1, 0, 0], [0, -1, annotations.height], [0, 0, 1]], dtype=np.float64)
+        annotations.transf(mat)
+        return np.ascontiguousarray(image), annotations
+
+
+class Rotate(Augmentation):
+    def __init__(self, angle: int = 90):
+        """Rotates the image counter clockwise in steps of 90 degrees.
+
+        Args:
+            angle (int): Rotation angle, must be a multiple of 90.
+        """
+        if angle % 90 != 0:
+            raise ValueError("Rotate only supports multiples of 90 degrees")
+        self.angle = angle % 360
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        k = self.angle // 90
+        width, height = annotations.width, annotations.height
+        image = np.rot90(image, k)
+        if k == 1:
+            mat = np.array([[0, 1, 0], [-1, 0, width], [0, 0, 1]], dtype=np.float64)
+        elif k == 2:
+            mat = np.array([[-1, 0, width], [0, -1, height], [0, 0, 1]], dtype=np.float64)
+        elif k == 3:
+            mat = np.array([[0, -1, height], [1, 0, 0], [0, 0, 1]], dtype=np.float64)
+        else:
+            return image, annotations
+        annotations.transf(mat)
+        if k % 2 == 1:
+            annotations.width, annotations.height = height, width
+        return np.ascontiguousarray(image), annotations
+
+
+class Scale(Augmentation):
+    def __init__(self, x: float = 1.0, y: float = 1.0):
+        """Resizes the image by the given factors per axis."""
+        self.x = x
+        self.y = y
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        _require_cv2()
+        height, width = image.shape[:2]
+        image = cv2.resize(image, (int(width * self.x), int(height * self.y)))
+        annotations.scale(self.x, self.y)
+        return image, annotations
+
+
+class Crop(Augmentation):
+    def __init__(self, x_min: int, y_min: int, width: int, height: int):
+        """Crops a fixed region out of the image."""
+        self.x_min = x_min
+        self.y_min = y_min
+        self.width = width
+        self.height = height
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        image = image[self.y_min:self.y_min + self.height, self.x_min:self.x_min + self.width]
+        annotations.border(
+            self.x_min, self.x_min + self.width, self.y_min, self.y_min + self.height
+        )
+        return np.ascontiguousarray(image), annotations
+
+
+class Brightness(Augmentation):
+    def __init__(self, delta: int = 0):
+        """Adds a constant offset to all pixels."""
+        self.delta = delta
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        image = np.clip(image.astype(np.int16) + self.delta, 0, 255).astype(np.uint8)
+        return image, annotations
+
+
+class GaussianNoise(Augmentation):
+    def __init__(self, std: float = 5.0):
+        """Adds zero mean gaussian noise to all pixels."""
+        self.std = std
+
+    def apply(self, image: np.ndarray, annotations: Annotations):
+        gen = self.gen if self.gen is not None else np.random.default_rng()
+        noise = gen.normal(0, self.std, image.shape)
+        image = np.clip(image.astype(np.float64) + noise, 0, 255).astype(np.uint8)
+        return image, annotations
+
+
+class Mixup(Augmentation):
+    inflation = 0.5
+
+    def __init__(self, alpha: float = 0.5):
+        """Blends two samples into one.
+
+        Args:
+            alpha (float): Weight of the first sample.
+        """
+        self.alpha = alpha
+
+    def apply(self, images: List[np.ndarray], annotations: List[Annotations]):
+        first, second = images[0], images[1]
+        if first.shape != second.shape:
+            _require_cv2()
+            second = cv2.resize(second, (first.shape[1], first.shape[0]))
+            annotations[1].scale(
+                first.shape[1] / annotations[1].width, first.shape[0] / annotations[1].height
+            )
+        if _mixup_blend is not None:
+            image = _mixup_blend(
+                np.ascontiguousarray(first), np.ascontiguousarray(second), self.alpha
+            )
+        else:
+            image = (
+                first.astype(np.float64) * self.alpha
+                + second.astype(np.float64) * (1 - self.alpha)
+            ).astype(np.uint8)
+        merged = annotations[0]
+        merged.extend(annotations[1])
+        return image, merged
+
+
+class Mosaic(Augmentation):
+    inflation = 0.25
+
+    def apply(self, images: List[np.ndarray], annotations: List[Annotations]):
+        """Assembles four samples into a 2x2 grid of the first sample's size."""
+        _require_cv2()
+        height, width = images[0].shape[:2]
+        tile_h, tile_w = height // 2, width // 2
+        grid = np.zeros((tile_h * 2, tile_w * 2) + images[0].shape[2:], dtype=images[0].dtype)
+        merged = Annotations(tile_w * 2, tile_h * 2)
+        offsets = [(0, 0), (tile_w, 0), (0, tile_h), (tile_w, tile_h)]
+        for image, annots, (off_x, off_y) in zip(images, annotations, offsets):
+            annots.scale(tile_w / annots.width, tile_h / annots.height)
+            image = cv2.resize(image, (tile_w, tile_h))
+            grid[off_y:off_y + tile_h, off_x:off_x + tile_w] = image
+            for annot in annots:
+                annot.shift(off_x, off_y)
+            merged.annots.extend(annots.annots)
+        return grid, merged
+
+
+# name -> augmentation class, populated once at import time
+REGISTRY = {
+    name: obj
+    for name, obj in dict(globals()).items()
+    if isinstance(obj, type) and issubclass(obj, Augmentation) and obj is not Augmentation
+}
@@ -0,0 +1,94 @@
+"""Boundary classes wrapping the raw point arrays of annotations."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class Boundary:
+    def __init__(self, points: np.ndarray):
+        """Base boundary. Holds a (n, 2) array of xy points.
+
+        Points are kept in float32 - pixel coordinates need nowhere near
+        float64 precision, and the narrower dtype halves the memory traffic
+        of every vectorized transform pass.
+
+        Args:
+            points (np.ndarray): Points spanning the boundary.
+        """
+        self.points = np.asarray(points, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def area(self) -> float:
+        return 0.0
+
+    @property
+    def center(self) -> np.ndarray:
+        return self.points.mean(axis=0)
+
+    def shift(self, x: float, y: float) -> None:
+        self.points = self.points + np.array([x, y], dtype=self.points.dtype)
+
+    def scale(self, x: float, y: float) -> None:
+        self.points = self.points * np.array([x, y], dtype=self.points.dtype)
+
+    def rotate(self, angle: float, center: np.ndarray) -> None:
+        """Rotates all points by angle (degrees, counter clockwise) around center."""
+        rad = np.deg2rad(angle)
+        cos, sin = np.cos(rad), np.sin(rad)
+        dtype = self.points.dtype
+        rot_mat = np.array([[cos, -sin], [sin, cos]], dtype=dtype)
+        center = np.asarray(center, dtype=dtype)
+        self.points = (self.points - center) @ rot_mat.T + center
+
+    def clip(self, x_min: float, y_min: float, x_max: float, y_max: float) -> None:
+        dtype = self.points.dtype
+        self.points = np.clip(
+            self.points,
+            np.array([x_min, y_min], dtype=dtype),
+            np.array([x_max, y_max], dtype=dtype),
+        )
+
+    def normalize(self) -> None:
+        """Re-establishes the class invariant after a raw point write. The
+        base boundary has none."""
+
+
+class KeyPointBoundary(Boundary):
+    """Boundary of independent key points. Has no spanned area."""
+
+
+class BoxBoundary(Boundary):
+    def __init__(self, points: np.ndarray):
+        """Axis aligned box boundary, stored as min and max corner."""
+        super().__init__(points)
+        self._assure_box()
+
+    @property
+    def area(self) -> float:
+        width = self.points[1][0] - self.points[0][0]
+        height = self.points[1][1] - self.points[0][1]
+        return float(width * height)
+
+    def rotate(self, angle: float, center: np.ndarray) -> None:
+        super().rotate(angle, center)
+        self._assure_box()
+
+    def normalize(self) -> None:
+        self._assure_box()
+
+    def _assure_box(self) -> None:
+        """Re-derives the axis aligned min/max corners from the current points."""
+        self.points = np.stack((self.points.min(axis=0), self.points.max(axis=0)))
+
+
+class PolygonBoundary(Boundary):
+    @property
+    def area(self) -> float:
+        """Polygon area via the shoelace formula."""
+        x = self.points[:, 0]
+        y = self.points[:, 1]
+        return float(abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1))) / 2)
@@ -0,0 +1,42 @@
+"""Shared string constants for blueprint parsing and path execution."""
+
+# block/node categories
+NODE_TYPE_INPUT = "input"
+NODE_TYPE_AUGMENT = "augmentation"
+
+# blueprint block keys
+BLOCK_ID = "id"
+BLOCK_CATEGORY = "category"
+BLOCK_NEXT = "next"
+BLOCK_SHARES = "shares"
+BLOCK_PARAMS = "params"
+
+# top level config keys
+CONFIG_KEY_BLOCKS = "blocks"
+CONFIG_KEY_DATASETS = "datasets"
+CONFIG_KEY_SEED = "seed"
+CONFIG_KEY_FILTER = "filter"
+CONFIG_KEY_BACKGROUND_PERCENTAGE = "background_percentage"
+CONFIG_KEY_IMAGE_DIR = "image_dir"
+CONFIG_KEY_ANNOTATION_PATH = "annotation_path"
+
+# annotation file keys
+IMAGES_STR = "images"
+FILE_STR = "file"
+WIDTH_STR = "width"
+HEIGHT_STR = "height"
+ANNOTATIONS_STR = "annotations"
+BOUNDARY_STR = "boundary"
+BOUNDARY_TYPE_STR = "boundary_type"
+LABEL_ID_STR = "label_id"
+LABEL_NAME_STR = "label_name"
+
+# fetched path keys
+PATH_INPUTS = "inputs"
+PATH_AUGMENTATIONS = "augmentations"
+PATH_USES = "uses"
+PATH_OUTPUT = "output"
+PATH_CHAINS = "chains"
+
+# executor data keys
+DATA_OUTPUT = "output"
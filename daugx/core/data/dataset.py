@@ -0,0 +1,133 @@
+"""Dataset containers holding the loaded samples of one data source."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from daugx.core.augmentation.annotations import Annotations
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+class DataPackage:
+    def __init__(self, image_path: str, annotations: Annotations):
+        """One sample of a dataset - the image stays on disk until loaded.
+
+        Args:
+            image_path (str): Path to the image file.
+            annotations (Annotations): Annotations of the image.
+        """
+        self.__image_path = image_path
+        self.__annotations = annotations
+
+    @property
+    def image_path(self) -> str:
+        return self.__image_path
+
+    @property
+    def annotations(self) -> Annotations:
+        return self.__annotations
+
+    def load(self, image_bytes: Optional[bytes] = None) -> Tuple[np.ndarray, Annotations]:
+        """Loads the image and returns it with a fresh copy of the
+        annotations.
+
+        Args:
+            image_bytes (bytes): Raw file content to decode instead of
+                reading from disk, used by batched readers.
+        """
+        if cv2 is None:
+            raise ImportError("opencv-python is required to load images")
+        if image_bytes is None:
+            image = cv2.imread(self.__image_path)
+        else:
+            image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise FileNotFoundError(f"Unable to read image '{self.__image_path}'")
+        return image, deepcopy(self.__annotations)
+
+
+class Dataset:
+    def __init__(
+        self,
+        data_packages: List[DataPackage],
+        filter_: Optional[Any] = None,
+        background_percentage: Optional[float] = None,
+    ):
+        """All samples of one configured data source.
+
+        Args:
+            data_packages (list): Loaded data packages.
+            filter_ (str): Filter expression applied to the dataset.
+            background_percentage (float): Share of background-only samples to
+                keep when filtering.
+        """
+        self.__data_packages = data_packages
+        self.__filter = filter_
+        self.__background_percentage = background_percentage
+        self.__sample_probs = self._build_sample_probs()
+
+    def _build_sample_probs(self) -> Optional[np.ndarray]:
+        """Precomputes per-package sampling weights. Returns None when all
+        packages are weighted uniformly."""
+        if self.__background_percentage is None or not self.__data_packages:
+            return None
+        # background packages carry no annotations; their combined weight is
+        # pinned to the configured share
+        is_background = np.fromiter(
+            (len(package.annotations) == 0 for package in self.__data_packages),
+            dtype=np.bool_,
+            count=len(self.__data_packages),
+        )
+        n_background = int(is_background.sum())
+        if n_background == 0 or n_background == len(self.__data_packages):
+            return None
+        probs = np.empty(len(self.__data_packages), dtype=np.float64)
+        probs[is_background] = self.__background_percentage / n_background
+        probs[~is_background] = (1.0 - self.__background_percentage) / (
+            len(self.__data_packages) - n_background
+        )
+        return probs
+
+    @property
+    def data_packages(self) -> List[DataPackage]:
+        return self.__data_packages
+
+    @property
+    def filter(self) -> Optional[Any]:
+        return self.__filter
+
+    @property
+    def background_percentage(self) -> Optional[float]:
+        return self.__background_percentage
+
+    def __len__(self) -> int:
+        return len(self.__data_packages)
+
+    def draw_index(self, gen: np.random.Generator) -> int:
+        """Draws the index of one random sample, weighted by the sample
+        probabilities when set. Splitting the draw from the load lets the
+        executor resolve a whole batch of reads up front."""
+        if self.__sample_probs is None:
+            return int(gen.integers(0, len(self.__data_packages)))
+        return int(gen.choice(len(self.__data_packages), p=self.__sample_probs))
+
+    def image_path(self, index: int) -> str:
+        return self.__data_packages[index].image_path
+
+    def load(
+        self, index: int, image_bytes: Optional[bytes] = None
+    ) -> Tuple[np.ndarray, Annotations]:
+        """Loads the sample at index, decoding from image_bytes when the file
+        content was already read elsewhere."""
+        return self.__data_packages[index].load(image_bytes)
+
+    def fetch(self, gen: np.random.Generator) -> Tuple[np.ndarray, Annotations]:
+        """Fetches one random sample from the dataset."""
+        return self.load(self.draw_index(gen))
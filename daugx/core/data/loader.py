@@ -0,0 +1,42 @@
+"""Initial loading of datasets from disk."""
+
+from __future__ import annotations
+
+import os
+from typing import List
+
+import numpy as np
+
+import daugx.core.constants as c
+from daugx.core.augmentation.annotations import Annotations
+from daugx.core.data.dataset import DataPackage
+from daugx.utils.misc import load_json
+
+
+class InitialLoader:
+    def __init__(self, image_dir: str, annotation_path: str):
+        """Loads one dataset from an image directory and an annotation file.
+
+        Args:
+            image_dir (str): Directory holding the image files.
+            annotation_path (str): Path to the json annotation file.
+        """
+        self.__image_dir = image_dir
+        self.__annotation_path = annotation_path
+
+    def load(self) -> List[DataPackage]:
+        """Parses the annotation file and returns one DataPackage per image."""
+        spec = load_json(self.__annotation_path)
+        data_packages = []
+        for image_spec in spec[c.IMAGES_STR]:
+            annotations = Annotations(image_spec[c.WIDTH_STR], image_spec[c.HEIGHT_STR])
+            for annotation_spec in image_spec.get(c.ANNOTATIONS_STR, []):
+                annotations.add(
+                    np.asarray(annotation_spec[c.BOUNDARY_STR], dtype=np.float64),
+                    annotation_spec[c.LABEL_ID_STR],
+                    annotation_spec[c.LABEL_NAME_STR],
+                    annotation_spec.get(c.BOUNDARY_TYPE_STR, "Box"),
+                )
+            image_path = os.path.join(self.__image_dir, image_spec[c.FILE_STR])
+            data_packages.append(DataPackage(image_path, annotations))
+        return data_packages
@@ -0,0 +1,135 @@
+"""Nodes of a blueprint plan.
+
+A node mirrors one raw blueprint block. The plan layer analyzes a blueprint
+statically - nodes are never executed, they only carry the topology and
+probability information needed to enumerate execution paths.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import List, Optional
+
+import daugx.core.constants as c
+from daugx.core.augmentation import augmentations
+
+
+class Node:
+    __slots__ = (
+        "id",
+        "category",
+        "next",
+        "prev",
+        "shares",
+        "_is_input",
+        "_is_div",
+        "_is_infl",
+        "_is_out",
+        "_next_pos",
+    )
+
+    def __init__(self, id_: str, category: str, next_: List[str], shares: List[float]):
+        """Common state of all plan nodes.
+
+        Args:
+            id_ (str): Unique node id from the blueprint.
+            category (str): Node category - input or augmentation.
+            next_ (list): Ids of the next nodes. Empty for output nodes.
+            shares (list): Share of data routed to each next node.
+        """
+        # interned ids give dict probes and equality checks in the build
+        # loops a pointer-comparison fast path
+        self.id = sys.intern(id_)
+        self.category = category
+        self.next = [sys.intern(next_id) for next_id in next_]
+        self.prev: List[str] = []
+        self.shares = list(shares)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id='{self.id}')"
+
+
+class InputNode(Node):
+    __slots__ = ("dataset", "n_data")
+
+    def __init__(self, id_: str, next_: List[str], shares: List[float], dataset: int = 0,
+                 n_data: int = 1, **params):
+        """Input node. References one dataset of the blueprint.
+
+        Args:
+            dataset (int): Index of the dataset this input draws from.
+            n_data (int): Relative data weight of this input against the
+                other inputs of the blueprint.
+        """
+        super().__init__(id_, c.NODE_TYPE_INPUT, next_, shares)
+        self.dataset = dataset
+        self.n_data = n_data
+
+
+class AugmentNode(Node):
+    __slots__ = ("class_name", "exe_prob", "inflation", "n_inputs")
+
+    def __init__(self, id_: str, next_: List[str], shares: List[float], class_name: str = "",
+                 exe_prob: float = 1.0, **params):
+        """Augmentation node. Carries the static properties of the
+        augmentation class without instantiating it.
+
+        Args:
+            class_name (str): Name of the augmentation class.
+            exe_prob (float): Internal execution probability of the block.
+        """
+        super().__init__(id_, c.NODE_TYPE_AUGMENT, next_, shares)
+        augmentation_cls = augmentations.REGISTRY.get(class_name)
+        if augmentation_cls is None:
+            raise ValueError(f"Unknown augmentation '{class_name}'")
+        self.class_name = class_name
+        self.exe_prob = exe_prob
+        self.inflation = augmentation_cls.inflation
+        self.n_inputs = round(1 / self.inflation) if self.inflation < 1 else 1
+
+
+_NODE_CTORS = {
+    c.NODE_TYPE_INPUT: InputNode,
+    c.NODE_TYPE_AUGMENT: AugmentNode,
+}
+
+
+def dict_to_node(node_dict: dict) -> Node:
+    """Parses one raw blueprint dict into its concrete node class."""
+    category = node_dict[c.BLOCK_CATEGORY]
+    try:
+        ctor = _NODE_CTORS[category]
+    except KeyError:
+        raise ValueError(f"Unknown node category '{category}'")
+    node = ctor(
+        node_dict[c.BLOCK_ID],
+        node_dict.get(c.BLOCK_NEXT, []),
+        node_dict.get(c.BLOCK_SHARES, [1.0]),
+        **node_dict.get(c.BLOCK_PARAMS, {}),
+    )
+    # classification is static once the node is parsed - cache it so the
+    # hot build loops read one attribute instead of re-deriving it per visit
+    node._is_input = is_input(node)
+    node._is_div = is_dividing(node)
+    node._is_infl = is_inflationary(node)
+    node._is_out = is_output(node)
+    # next is final after parsing - hash-map the id positions so share
+    # lookups at dividing boundaries skip list.index scans
+    node._next_pos = {next_id: i for i, next_id in enumerate(node.next)}
+    return node
+
+
+def is_input(node: Optional[Node]) -> bool:
+    return isinstance(node, InputNode)
+
+
+def is_dividing(node: Optional[Node]) -> bool:
+    return node is not None and len(node.next) > 1
+
+
+def is_inflationary(node: Optional[Node]) -> bool:
+    return isinstance(node, AugmentNode) and node.inflation < 1
+
+
+def is_output(node: Optional[Node]) -> bool:
+    return node is not None and not node.next
@@ -0,0 +1,302 @@
+"""Static analysis of a blueprint.
+
+The plan enumerates every execution path of a blueprint together with the
+probability that a random data item traverses it - without building or
+running any blocks. Nodes are grouped into linear sequences, sequences are
+chained into paths, and paths stalled in front of inflationary nodes are
+merged once all their feeders are known.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import daugx.core.constants as c
+from daugx.core.plan.node import Node, dict_to_node
+from daugx.core.plan.sequence import Path, Sequence
+from daugx.utils.misc import load_json
+
+
+class Plan:
+    def __init__(self, file_path: str, seed: Optional[int] = None):
+        """Builds the full path plan of a blueprint.
+
+        Args:
+            file_path (str): Path to the blueprint json file.
+            seed (int): Seed for path sampling.
+        """
+        config = load_json(file_path)
+        node_dicts = config[c.CONFIG_KEY_BLOCKS] if isinstance(config, dict) else config
+        self.__gen = np.random.default_rng(seed)
+        self.nodes: List[Node] = []
+        # id -> node, so node lookups stay O(1) regardless of blueprint size
+        self._nodes_by_id: Dict[str, Node] = {}
+        self.sequences: List[Sequence] = []
+        # start/end node id -> sequences, so boundary resolution during
+        # sequence and path construction stays O(1) per lookup
+        self._seqs_by_start_id: Dict[str, List[Sequence]] = defaultdict(list)
+        self._seqs_by_end_id: Dict[str, List[Sequence]] = defaultdict(list)
+        # content keys of all registered sequences, for O(1) dedup in add_seq
+        self._seq_keys: set = set()
+        self.paths: List[Path] = []
+        # prefix sums / normalized probs over path exe_probs; rebuilt lazily
+        # after path changes
+        self._prefix: Optional[np.ndarray] = None
+        self._probs: Optional[np.ndarray] = None
+        # pre-drawn uniform variates consumed by _get_path; refilling in bulk
+        # amortizes the per-draw generator call over the whole buffer
+        self.__uniform_buf = self.__gen.random(1024)
+        self.__uniform_pos = 0
+        self._init_nodes(node_dicts)
+        self._init_seqs()
+        self._init_paths()
+
+    def fetch_path(self) -> Path:
+        """Samples one complete path, weighted by execution probability."""
+        return self._get_path()
+
+    def sample_paths(self, n: int) -> List[Path]:
+        """Samples n paths in one vectorized draw, weighted by execution
+        probability - amortizes the per-draw Python overhead across a batch."""
+        if self._probs is None:
+            probs = np.array([path.exe_prob for path in self.paths], dtype=np.float64)
+            self._probs = probs / probs.sum()
+        indices = self.__gen.choice(len(self.paths), size=n, p=self._probs)
+        return [self.paths[i] for i in indices]
+
+    def _init_nodes(self, node_dicts: List[dict]) -> None:
+        self.nodes = [dict_to_node(node_dict) for node_dict in node_dicts]
+        self._nodes_by_id = {node.id: node for node in self.nodes}
+        for node in self.nodes:
+            for next_id in node.next:
+                self._get_node_by_id(next_id).prev.append(node.id)
+        # blueprint ids interned to small ints, so sequences can keep their
+        # node ids in flat uint32 arrays
+        self._id_to_int = {node.id: i for i, node in enumerate(self.nodes)}
+        self._topo_order = self._topo_sort()
+        self._topo_index = {node.id: i for i, node in enumerate(self._topo_order)}
+        # input nodes are read by seeding and path construction - filter once
+        self._ipt_nodes = [node for node in self.nodes if node._is_input]
+
+    def _topo_sort(self) -> List[Node]:
+        """Kahn's algorithm over the next pointers. Also validates that the
+        blueprint is acyclic."""
+        indegree = {node.id: len(node.prev) for node in self.nodes}
+        queue = deque(node for node in self.nodes if not node.prev)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for next_id in node.next:
+                indegree[next_id] -= 1
+                if indegree[next_id] == 0:
+                    queue.append(self._get_node_by_id(next_id))
+        if len(order) != len(self.nodes):
+            raise ValueError("Blueprint contains a cycle")
+        return order
+
+    def _get_node_by_id(self, id_: str) -> Optional[Node]:
+        return self._nodes_by_id.get(id_)
+
+    def _get_ipt_nodes(self) -> List[Node]:
+        return self._ipt_nodes
+
+    def _init_seqs(self) -> None:
+        """Single forward sweep over the topological node order: every
+        boundary target starts exactly one linear run, so no start node is
+        ever discovered (or walked) twice."""
+        for node in self._topo_order:
+            if self._is_seq_start(node):
+                self._build_seqs(node)
+        self._set_ipt_seqs_exe_probs()
+        self._propagate_exe_prob()
+
+    def _is_seq_start(self, node: Node) -> bool:
+        if node._is_input or node._is_infl:
+            return True
+        return any(self._get_node_by_id(prev_id)._is_div for prev_id in node.prev)
+
+    def _build_seqs(self, start_node: Node) -> None:
+        """Builds the single linear run starting at start_node. Hot-loop
+        names are bound locally so each step runs on LOAD_FAST instead of
+        repeated attribute lookups."""
+        seq = Sequence()
+        node = start_node
+        id_to_int = self._id_to_int
+        add_node = seq.add_node
+        get_node = self._get_node_by_id
+        while True:
+            add_node(node, id_to_int[node.id])
+            if node._is_out or node._is_div:
+                break
+            next_node = get_node(node.next[0])
+            if next_node._is_infl:
+                seq.next_node = next_node
+                break
+            node = next_node
+        self.add_seq(seq)
+
+    def add_seq(self, sequence: Sequence) -> bool:
+        """Registers sequence unless an equal sequence is already known.
+        Returns whether the sequence was added."""
+        key = (
+            sequence.node_id_bytes(),
+            sequence.next_node.id if sequence.next_node is not None else None,
+        )
+        if key in self._seq_keys:
+            return False
+        self._seq_keys.add(key)
+        self.sequences.append(sequence)
+        self._seqs_by_start_id[sequence.start_id].append(sequence)
+        self._seqs_by_end_id[sequence.end_id].append(sequence)
+        return True
+
+    def _get_seqs(
+        self, start_node_id: Optional[str] = None, end_node_id: Optional[str] = None
+    ) -> List[Sequence]:
+        """Returns all sequences matching the given start and/or end node id."""
+        if start_node_id is not None and end_node_id is not None:
+            return [
+                seq
+                for seq in self._seqs_by_start_id.get(start_node_id, [])
+                if seq.end_id == end_node_id
+            ]
+        if start_node_id is not None:
+            return list(self._seqs_by_start_id.get(start_node_id, []))
+        if end_node_id is not None:
+            return list(self._seqs_by_end_id.get(end_node_id, []))
+        return list(self.sequences)
+
+    def _set_ipt_seqs_exe_probs(self) -> None:
+        """Seeds the input sequences with their share of the overall data,
+        derived from the n_data weights of the input nodes."""
+        ipt_nodes = self._get_ipt_nodes()
+        data_sum = sum(node.n_data for node in ipt_nodes)
+        for node in ipt_nodes:
+            for seq in self._get_seqs(start_node_id=node.id):
+                seq.exe_prob = node.n_data / data_sum
+                seq.total_exe_prob = seq.exe_prob
+
+    def _propagate_exe_prob(self) -> None:
+        """Propagates probability mass from the input sequences through all
+        boundaries. Sequences are processed in topological order of their
+        start nodes, so every predecessor is resolved before its consumers -
+        one pass, no fixpoint iteration."""
+        ordered = sorted(
+            (seq for seq in self.sequences if seq.total_exe_prob is None),
+            key=lambda seq: self._topo_index[seq.start_id],
+        )
+        for seq in ordered:
+            prev_seqs = self._get_prev_seqs(seq)
+            total = 0.0
+            mass_in = 0.0
+            for prev in prev_seqs:
+                total += prev.total_exe_prob * self._get_edge_share(prev, seq)
+                mass_in += prev.total_exe_prob
+            start_node = seq.get_start_node()
+            if start_node._is_infl:
+                # n inputs merge into one output - mass shrinks accordingly
+                total *= start_node.inflation
+            seq.exe_prob = total / mass_in if mass_in else 0.0
+            seq.total_exe_prob = total
+
+    def _get_prev_seqs(self, sequence: Sequence) -> List[Sequence]:
+        start_node = sequence.get_start_node()
+        return [
+            seq
+            for prev_id in start_node.prev
+            for seq in self._seqs_by_end_id.get(prev_id, [])
+        ]
+
+    @staticmethod
+    def _get_edge_share(prev: Sequence, sequence: Sequence) -> float:
+        end_node = prev.get_end_node()
+        if end_node._is_div:
+            return end_node.shares[end_node._next_pos[sequence.start_id]]
+        return 1.0
+
+    def _init_paths(self) -> None:
+        incomplete: List[Path] = []
+        for ipt_node in self._get_ipt_nodes():
+            for seq in self._get_seqs(start_node_id=ipt_node.id):
+                path = Path(exe_prob=seq.exe_prob)
+                path.add_sequence(seq)
+                self._build_linear_path(path, incomplete)
+        while incomplete:
+            groups = self._group_incomplete_paths(incomplete)
+            incomplete = []
+            for merged in self._combine_groups(groups):
+                self._build_linear_path(merged, incomplete)
+
+    def _build_linear_path(self, path: Path, incomplete: List[Path]) -> None:
+        """Extends path sequence by sequence until it completes at an output
+        or stalls in front of an inflationary node. Branches at dividing
+        nodes are processed from an explicit work-stack."""
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            seq = path.sequences[-1]
+            if seq.next_node is not None:
+                path.next_node = seq.next_node
+                incomplete.append(path)
+                continue
+            end_node = seq.get_end_node()
+            if end_node._is_out:
+                self.add_path(path)
+                continue
+            for next_id, share in zip(end_node.next, end_node.shares):
+                for next_seq in self._get_seqs(start_node_id=next_id):
+                    branch = Path(exe_prob=path.exe_prob * share)
+                    branch.sequences = path.sequences + [next_seq]
+                    stack.append(branch)
+
+    @staticmethod
+    def _group_incomplete_paths(incomplete: List[Path]) -> Dict[str, List[Path]]:
+        groups: Dict[str, List[Path]] = defaultdict(list)
+        for path in incomplete:
+            groups[path.next_node.id].append(path)
+        return groups
+
+    def _combine_groups(self, groups: Dict[str, List[Path]]) -> List[Path]:
+        """Merges every group of stalled paths at its inflationary node into
+        one continued path. All mass arriving at the node flows on, shrunk by
+        the node's inflation."""
+        merged_paths = []
+        for node_id, group in groups.items():
+            node = group[0].next_node
+            merged = Path(exe_prob=sum(path.exe_prob for path in group) * node.inflation)
+            for path in group:
+                merged.sequences.extend(path.sequences)
+            for next_seq in self._get_seqs(start_node_id=node_id):
+                merged.add_sequence(next_seq)
+            merged_paths.append(merged)
+        return merged_paths
+
+    def add_path(self, path: Path) -> None:
+        self.paths.append(path)
+        self._prefix = None
+        self._probs = None
+
+    def _draw_uniform(self) -> float:
+        """Returns one uniform float from the pre-drawn buffer, refilling it
+        when exhausted."""
+        pos = self.__uniform_pos
+        if pos >= self.__uniform_buf.shape[0]:
+            self.__uniform_buf = self.__gen.random(1024)
+            pos = 0
+        self.__uniform_pos = pos + 1
+        return float(self.__uniform_buf[pos])
+
+    def _get_path(self) -> Path:
+        """Samples one path by binary search over the prefix sums of the
+        path probabilities - O(log P) per draw instead of a linear walk."""
+        if self._prefix is None:
+            self._prefix = np.cumsum(
+                [path.exe_prob for path in self.paths], dtype=np.float64
+            )
+        rand = self._draw_uniform() * self._prefix[-1]
+        index = int(np.searchsorted(self._prefix, rand, side="right"))
+        return self.paths[min(index, len(self.paths) - 1)]
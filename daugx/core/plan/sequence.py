@@ -0,0 +1,108 @@
+"""Sequences and paths assembled from plan nodes.
+
+A sequence is a maximal linear run of nodes between two boundaries - a
+boundary being a dividing node, an inflationary node or an output. A path
+chains sequences from an input to an output and carries the probability
+that a random data item traverses exactly that chain.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Optional
+
+from daugx.core.plan.node import Node
+
+
+class Sequence:
+    __slots__ = (
+        "_Sequence__nodes",
+        "_node_id_arr",
+        "_start_id",
+        "_end_id",
+        "exe_prob",
+        "total_exe_prob",
+        "next_node",
+    )
+
+    def __init__(self):
+        self.__nodes: List[Node] = []
+        # interned node ids as a contiguous uint32 array - sequence hashing
+        # and comparison read this instead of chasing node objects
+        self._node_id_arr = array("I")
+        # boundary ids cached on insertion - lookups and index maintenance
+        # read plain attributes instead of list tail + attribute chains
+        self._start_id: Optional[str] = None
+        self._end_id: Optional[str] = None
+        # probability of entering this sequence from its boundary, derived
+        # from the edge shares during propagation
+        self.exe_prob: float = 1.0
+        # probability mass flowing through this sequence, set by propagation
+        self.total_exe_prob: Optional[float] = None
+        # inflationary node this sequence hands its data to, None otherwise
+        self.next_node: Optional[Node] = None
+
+    @property
+    def nodes(self) -> List[Node]:
+        return self.__nodes
+
+    @property
+    def start_id(self) -> Optional[str]:
+        return self._start_id
+
+    @property
+    def end_id(self) -> Optional[str]:
+        return self._end_id
+
+    def add_node(self, node: Node, int_id: Optional[int] = None) -> None:
+        self.__nodes.append(node)
+        if int_id is not None:
+            self._node_id_arr.append(int_id)
+        if self._start_id is None:
+            self._start_id = node.id
+        self._end_id = node.id
+
+    def node_id_bytes(self) -> bytes:
+        return self._node_id_arr.tobytes()
+
+    def get_start_node(self) -> Node:
+        return self.__nodes[0]
+
+    def get_end_node(self) -> Node:
+        return self.__nodes[-1]
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __iter__(self):
+        return iter(self.__nodes)
+
+    def __repr__(self) -> str:
+        ids = [node.id for node in self.__nodes]
+        return f"Sequence(nodes={ids})"
+
+
+class Path:
+    __slots__ = ("sequences", "exe_prob", "next_node")
+
+    def __init__(self, exe_prob: float = 1.0):
+        self.sequences: List[Sequence] = []
+        self.exe_prob = exe_prob
+        # inflationary node this path waits on before it can continue
+        self.next_node: Optional[Node] = None
+
+    @property
+    def is_complete(self) -> bool:
+        return self.next_node is None
+
+    def add_sequence(self, sequence: Sequence) -> None:
+        self.sequences.append(sequence)
+
+    def node_ids(self) -> List[str]:
+        return [node.id for sequence in self.sequences for node in sequence]
+
+    def __len__(self) -> int:
+        return len(self.sequences)
+
+    def __repr__(self) -> str:
+        return f"Path(n_seqs={len(self.sequences)}, exe_prob={self.exe_prob})"
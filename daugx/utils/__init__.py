@@ -0,0 +1,9 @@
+from daugx.utils.misc import (
+    fetch_by_prob_list,
+    get_random,
+    is_api_key,
+    is_executed,
+    load_json,
+    new_id,
+    transpose_image,
+)
@@ -0,0 +1,14 @@
+"""Access to blueprints hosted on the daugx api."""
+
+from __future__ import annotations
+
+import json
+import urllib.request
+
+API_URL = "https://api.daugx.com/blueprint/{}"
+
+
+def get_config_from_api(api_key: str) -> dict:
+    """Downloads the blueprint configuration belonging to an api key."""
+    with urllib.request.urlopen(API_URL.format(api_key)) as response:
+        return json.loads(response.read())
@@ -0,0 +1,46 @@
+"""Batched file reading with overlapping I/O.
+
+Cold-cache image loading is bound by NVMe queue depth, not by any single
+read. Reading a batch of files through a pool of threads keeps many reads
+in flight at once - the GIL is released inside ``os.read`` - which gets
+close to io_uring throughput without a native dependency. Small batches
+skip the pool since thread dispatch would dominate.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# below this, sequential reads beat the thread dispatch overhead; the pool
+# costs microseconds to spin up while a single cold read costs milliseconds,
+# so overlapping pays off already at a handful of files
+MIN_BATCH_SIZE = 4
+MAX_QUEUE_DEPTH = 64
+
+
+def _read_file(path: str) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 1 << 20)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def submit_reads(paths: List[str]) -> List[bytes]:
+    """Reads all files and returns their contents in input order.
+
+    Batches of at least MIN_BATCH_SIZE files are read concurrently with up
+    to MAX_QUEUE_DEPTH reads in flight.
+    """
+    if len(paths) < MIN_BATCH_SIZE:
+        return [_read_file(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(len(paths), MAX_QUEUE_DEPTH)) as pool:
+        return list(pool.map(_read_file, paths))
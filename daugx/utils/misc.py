@@ -0,0 +1,95 @@
+"""Small shared helpers used across the daugx core modules."""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import string
+import sys
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ID_LENGTH = 8
+ID_CHARS = string.ascii_lowercase + string.digits
+
+_API_KEY_RE = re.compile(r"[A-Za-z0-9]{32}")
+
+
+def new_id(gen: Optional[np.random.Generator] = None) -> str:
+    """Returns a new random id string.
+
+    Args:
+        gen (np.random.Generator): Generator to draw from. When provided, ids are
+            reproducible under a fixed seed.
+    """
+    if gen is None:
+        return sys.intern("".join(random.choices(ID_CHARS, k=ID_LENGTH)))
+    indices = gen.integers(0, len(ID_CHARS), size=ID_LENGTH)
+    return sys.intern("".join(ID_CHARS[i] for i in indices))
+
+
+def get_random() -> float:
+    """Returns a uniform random float in [0, 1)."""
+    return random.random()
+
+
+def is_executed(prob: float, gen: np.random.Generator) -> bool:
+    """Draws once and checks whether an event with probability prob fires."""
+    return float(gen.random()) < prob
+
+
+def fetch_by_prob_list(
+    items: List[Any], probs: Union[List[float], np.ndarray], gen: np.random.Generator
+) -> Any:
+    """Fetches one item from items, weighted by probs.
+
+    Args:
+        items (list): Items to choose from.
+        probs (list | np.ndarray): Weights for each item. Lists are normalized
+            internally; ndarrays are assumed to be normalized already.
+        gen (np.random.Generator): Generator to draw from.
+    """
+    total = 1.0 if isinstance(probs, np.ndarray) else sum(probs)
+    rand = float(gen.random())
+    cumulative = 0.0
+    for item, prob in zip(items, probs):
+        cumulative += prob / total
+        if rand < cumulative:
+            return item
+    return items[-1]
+
+
+def is_api_key(input_: str) -> bool:
+    """Checks whether input_ looks like a daugx api key rather than a file path."""
+    return _API_KEY_RE.fullmatch(input_) is not None
+
+
+def load_json(file_path: str) -> Union[dict, list]:
+    """Loads a json file and returns its content.
+
+    Parses with orjson when available - its C parser avoids the per-object
+    Python allocation overhead of the stdlib module on large blueprints and
+    annotation files. Falls back to the stdlib parser otherwise.
+    """
+    if orjson is not None:
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def transpose_image(image: np.ndarray) -> np.ndarray:
+    """Transposes an image from HWC to CHW layout.
+
+    Returns an O(1) strided view, not a copy. Consumers that need CHW
+    contiguous memory (e.g. C extensions) must call np.ascontiguousarray
+    themselves at their boundary.
+    """
+    return image.transpose(2, 0, 1)